@@ -4,7 +4,6 @@ These include gene ontology/tissue/phenotype enrichment, enrichment for user-def
 set visualization ,etc. \
 Results of enrichment analyses can be saved to .csv files.
 """
-import functools
 import itertools
 import types
 import warnings
@@ -20,7 +19,6 @@ except ImportError:
 
 import matplotlib.pyplot as plt
 import matplotlib
-import matplotlib_venn as vn
 import numpy as np
 import pandas as pd
 import upsetplot
@@ -32,6 +30,7 @@ from rnalysis.utils import io, parsing, settings, validation, enrichment_runner,
 class FeatureSet:
     """ Receives a filtered gene set and the set's name (optional) and preforms various enrichment analyses on them. """
     __slots__ = {'gene_set': 'set of feature names/indices', 'set_name': 'name of the FeatureSet'}
+    _SAVE_CHUNK_SIZE = 65536
 
     def __init__(self, gene_set: Union[List[str], Set[str], 'Filter'] = None, set_name: str = ''):
 
@@ -50,18 +49,29 @@ class FeatureSet:
             >>> my_other_set = enrichment.FeatureSet(filter_obj, 'name of my other set')
 
         """
-        assert isinstance(set_name, str), f"'set_name' must be of type str, instead got {type(set_name)}."
+        if not isinstance(set_name, str):
+            raise TypeError(f"'set_name' must be of type str, instead got {type(set_name)}.")
         if gene_set is None:
             gene_set = parsing.data_to_set(parsing.from_string(
                 "Please insert genomic features/indices separated by newline \n"
                 "(example: \n'WBGene00000001\nWBGene00000002\nWBGene00000003')", delimiter='\n'))
-        elif validation.isinstanceinh(gene_set, Filter):
+        elif isinstance(gene_set, Filter):
             gene_set = gene_set.index_set
+        elif isinstance(gene_set, (set, frozenset)):
+            gene_set = gene_set if isinstance(gene_set, set) else set(gene_set)
         else:
             gene_set = parsing.data_to_set(gene_set)
         self.gene_set = gene_set
         self.set_name = set_name
 
+    @classmethod
+    def _from_set(cls, gene_set: set, set_name: str = ''):
+        # construct a new object from an already-validated python set, without going through __init__
+        obj = cls.__new__(cls)
+        obj.gene_set = gene_set
+        obj.set_name = set_name
+        return obj
+
     def __copy__(self):
         obj = type(self).__new__(type(self))
         obj.gene_set = self.gene_set.copy()
@@ -75,7 +85,7 @@ class FeatureSet:
         return len(self.gene_set)
 
     def __contains__(self, item):
-        return True if item in self.gene_set else False
+        return item in self.gene_set
 
     def __iter__(self):
         return self.gene_set.__iter__()
@@ -84,6 +94,9 @@ class FeatureSet:
         if type(self) != type(other):
             return False
 
+        if len(self.gene_set) != len(other.gene_set):
+            return False
+
         if self.set_name != other.set_name:
             return False
 
@@ -100,7 +113,8 @@ class FeatureSet:
         :type new_name: str
 
         """
-        assert isinstance(new_name, str), f"New set name must be of type str. Instead, got {type(new_name)}"
+        if not isinstance(new_name, str):
+            raise TypeError(f"New set name must be of type str. Instead, got {type(new_name)}")
         self.set_name = new_name
 
     def save_txt(self, fname: Union[str, Path]):
@@ -112,17 +126,19 @@ class FeatureSet:
         :param fname: full filename/path for the output file. Can include the '.txt' suffix but doesn't have to.
 
         """
-        assert isinstance(fname, (str, Path)), "fname must be str or pathlib.Path!"
-        if isinstance(fname, str):
-            if not fname.endswith('.txt'):
-                fname = fname + '.txt'
-        elif isinstance(fname, Path):
-            if not fname.suffix == '.txt':
-                fname = Path(f"{str(fname.parent)}{fname.name}.txt")
+        fname = Path(fname)
+        if fname.suffix != '.txt':
+            fname = fname.with_name(fname.name + '.txt')
+        # write the features in fixed-size chunks, so that very large sets are never joined into one huge string
+        features = iter(self.gene_set)
         with open(fname, 'w') as f:
-            for i, gene in enumerate(self.gene_set):
-                line = gene + '\n' if (i + 1) < len(self.gene_set) else gene
-                f.write(line)
+            chunk = list(itertools.islice(features, self._SAVE_CHUNK_SIZE))
+            f.write('\n'.join(chunk))
+            while len(chunk) == self._SAVE_CHUNK_SIZE:
+                chunk = list(itertools.islice(features, self._SAVE_CHUNK_SIZE))
+                if len(chunk) > 0:
+                    f.write('\n')
+                    f.write('\n'.join(chunk))
 
     def _set_ops(self, others: Union[set, 'FeatureSet', Tuple[Union[set, 'FeatureSet']]],
                  op: types.FunctionType) -> set:
@@ -136,22 +152,47 @@ class FeatureSet:
         :return: A set resulting from the set operation.
 
         """
-        others = list(others)
-        for i, other in enumerate(others):
-            if isinstance(other, set):
-                pass
-            elif isinstance(other, FeatureSet):
-                others[i] = other.gene_set
-            else:
+        converted = [other.gene_set if isinstance(other, FeatureSet) else other for other in others]
+        for other in converted:
+            if not isinstance(other, (set, frozenset)):
                 raise TypeError("'other' must be an FeatureSet object or a set!")
-        try:
-            return op(self.gene_set, *others)
-        except TypeError as e:
-            if op == set.symmetric_difference:
-                raise TypeError(
-                    f"Symmetric difference can only be calculated for two objects, {len(others) + 1} were given!")
-            else:
-                raise e
+        if op == set.symmetric_difference and len(converted) != 1:
+            raise TypeError(
+                f"Symmetric difference can only be calculated for two objects, {len(converted) + 1} were given!")
+
+        if op == set.intersection:
+            # intersect with the smallest sets first, so that every intermediate result stays as small as possible,
+            # and stop as soon as the running result becomes empty
+            operands = sorted([self.gene_set] + converted, key=len)
+            result = set(operands[0])
+            for other in operands[1:]:
+                if len(result) == 0:
+                    break
+                result.intersection_update(other)
+            return result
+        elif op == set.difference:
+            # the difference between a set and itself (or between an empty set and anything) is always empty
+            if len(self.gene_set) == 0 or any(other is self.gene_set for other in converted):
+                return set()
+            result = self.gene_set
+            for other in converted:
+                result = result.difference(other)
+                if len(result) == 0:
+                    break
+            return set(result) if result is self.gene_set else result
+        elif op == set.symmetric_difference:
+            if converted[0] is self.gene_set:
+                return set()
+        elif op == set.union:
+            # start from a copy of the largest set, so its hash table is allocated at (nearly) its final size
+            # and the smaller sets are inserted into it with few or no resizes
+            largest = max([self.gene_set] + converted, key=len)
+            result = set(largest)
+            for other in [self.gene_set] + converted:
+                if other is not largest:
+                    result.update(other)
+            return result
+        return op(self.gene_set, *converted)
 
     def union(self, *others: Union[set, 'FeatureSet']) -> 'FeatureSet':
 
@@ -175,7 +216,7 @@ class FeatureSet:
             {'WBGene00000003', 'WBGene00000004', 'WBGene00000001', 'WBGene00000002', 'WBGene00000006', 'WBGene00000005'}
 
         """
-        return FeatureSet(self._set_ops(others, set.union))
+        return FeatureSet._from_set(self._set_ops(others, set.union))
 
     def intersection(self, *others: Union[set, 'FeatureSet']) -> 'FeatureSet':
 
@@ -199,7 +240,7 @@ class FeatureSet:
             {'WBGene00000001'}
 
         """
-        return FeatureSet(self._set_ops(others, set.intersection))
+        return FeatureSet._from_set(self._set_ops(others, set.intersection))
 
     def difference(self, *others: Union[set, 'FeatureSet']) -> 'FeatureSet':
 
@@ -223,7 +264,7 @@ class FeatureSet:
             {'WBGene00000006'}
 
         """
-        return FeatureSet(self._set_ops(others, set.difference))
+        return FeatureSet._from_set(self._set_ops(others, set.difference))
 
     def symmetric_difference(self, other: Union[set, 'FeatureSet']) -> 'FeatureSet':
 
@@ -247,7 +288,7 @@ class FeatureSet:
             {'WBGene00000002', 'WBGene00000006', 'WBGene00000004'}
 
         """
-        return FeatureSet(self._set_ops((other,), set.symmetric_difference))
+        return FeatureSet._from_set(self._set_ops((other,), set.symmetric_difference))
 
     def go_enrichment(self, organism: Union[str, int, Literal['auto'], Literal[DEFAULT_ORGANISMS]] = 'auto',
                       gene_id_type: Union[str, Literal['auto'], Literal[GENE_ID_TYPES]] = 'auto', alpha: float = 0.05,
@@ -398,12 +439,9 @@ class FeatureSet:
            Example plot of go_enrichment(plot_horizontal = False)
         """
         propagate_annotations = propagate_annotations.lower()
-        if validation.isinstanceinh(background_genes, FeatureSet):
+        if isinstance(background_genes, FeatureSet):
             background_genes = background_genes.gene_set
-        if statistical_test.lower() == 'randomization':
-            kwargs = dict(reps=randomization_reps, random_seed=random_seed)
-        else:
-            kwargs = {}
+        kwargs = _get_pvalue_kwargs(statistical_test, reps=randomization_reps, random_seed=random_seed)
         runner = enrichment_runner.GOEnrichmentRunner(self.gene_set, organism, gene_id_type, alpha,
                                                       propagate_annotations, aspects, evidence_types,
                                                       excluded_evidence_types, databases, excluded_databases,
@@ -507,12 +545,9 @@ class FeatureSet:
 
            Example plot of kegg_enrichment(plot_horizontal = False)
         """
-        if validation.isinstanceinh(background_genes, FeatureSet):
+        if isinstance(background_genes, FeatureSet):
             background_genes = background_genes.gene_set
-        if statistical_test.lower() == 'randomization':
-            kwargs = dict(reps=randomization_reps, random_seed=random_seed)
-        else:
-            kwargs = {}
+        kwargs = _get_pvalue_kwargs(statistical_test, reps=randomization_reps, random_seed=random_seed)
         runner = enrichment_runner.KEGGEnrichmentRunner(self.gene_set, organism, gene_id_type, alpha,
                                                         return_nonsignificant, save_csv, fname, return_fig,
                                                         plot_horizontal, self.set_name, parallel, statistical_test,
@@ -612,8 +647,9 @@ class FeatureSet:
 
         """
         warnings.warn("This function is depracated, and will be removed in the next major release. "
-                      "Use the function 'FeatureSet.user_defined_enrichment()' instead.")
-        if validation.isinstanceinh(background_genes, FeatureSet):
+                      "Use the function 'FeatureSet.user_defined_enrichment()' instead.",
+                      DeprecationWarning, stacklevel=2)
+        if isinstance(background_genes, FeatureSet):
             background_genes = background_genes.gene_set
         runner = enrichment_runner.EnrichmentRunner(self.gene_set, attributes, alpha, attr_ref_path,
                                                     return_nonsignificant, save_csv, fname, return_fig, plot_horizontal,
@@ -710,12 +746,9 @@ class FeatureSet:
            Example plot of user_defined_enrichment(plot_horizontal = False)
 
         """
-        if validation.isinstanceinh(background_genes, FeatureSet):
+        if isinstance(background_genes, FeatureSet):
             background_genes = background_genes.gene_set
-        if statistical_test == 'randomization':
-            kwargs = dict(reps=randomization_reps)
-        else:
-            kwargs = dict()
+        kwargs = _get_pvalue_kwargs(statistical_test, reps=randomization_reps)
         runner = enrichment_runner.EnrichmentRunner(self.gene_set, attributes, alpha, attr_ref_path,
                                                     return_nonsignificant, save_csv, fname, return_fig, plot_horizontal,
                                                     self.set_name, parallel, statistical_test, biotype,
@@ -810,8 +843,9 @@ class FeatureSet:
 
         """
         warnings.warn("This function is depracated, and will be removed in the next major release. "
-                      "Use the function 'FeatureSet.user_defined_enrichment()' instead.")
-        if validation.isinstanceinh(background_genes, FeatureSet):
+                      "Use the function 'FeatureSet.user_defined_enrichment()' instead.",
+                      DeprecationWarning, stacklevel=2)
+        if isinstance(background_genes, FeatureSet):
             background_genes = background_genes.gene_set
         runner = enrichment_runner.EnrichmentRunner(self.gene_set, attributes, alpha, attr_ref_path,
                                                     return_nonsignificant, save_csv, fname, return_fig, plot_horizontal,
@@ -827,7 +861,8 @@ class FeatureSet:
                                    biotype_ref_path: Union[str, Path, Literal['predefined']] = 'predefined',
                                    plot_log_scale: bool = True,
                                    plot_style: Literal['interleaved', 'overlap'] = 'overlap', n_bins: int = 50,
-                                   save_csv: bool = False, fname=None, return_fig: bool = False, gui_mode: bool = False
+                                   save_csv: bool = False, fname=None, return_fig: bool = False,
+                                   parallel: bool = False, gui_mode: bool = False
                                    ) -> Union[pd.DataFrame, Tuple[pd.DataFrame, List[plt.Figure]]]:
         """
         Calculates enrichment and depletion of the FeatureSet for user-defined non-categorical attributes \
@@ -878,6 +913,10 @@ class FeatureSet:
         'C:/dir/file'. No '.csv' suffix is required. If None (default), fname will be requested in a manual prompt.
         :type return_fig: bool (default=False)
         :param return_fig: if True, returns a matplotlib Figure object in addition to the results DataFrame.
+        :type parallel: bool (default=False)
+        :param parallel: if True, will calculate the statistical tests using parallel processing. \
+        Parallel processing is mostly beneficial when testing a large number of attributes, \
+        and does not affect the results of the analysis otherwise.
         :rtype: pd.DataFrame (default) or Tuple[pd.DataFrame, matplotlib.figure.Figure]
         :return: a pandas DataFrame with the indicated attribute names as rows/index; \
         and a matplotlib Figure, if 'return_figure' is set to True.
@@ -896,19 +935,19 @@ class FeatureSet:
            Example plot of non_categorical_enrichment(plot_style='interleaved')
         """
 
-        if validation.isinstanceinh(background_genes, FeatureSet):
+        if isinstance(background_genes, FeatureSet):
             background_genes = background_genes.gene_set
         runner = enrichment_runner.NonCategoricalEnrichmentRunner(self.gene_set, attributes, alpha, biotype,
                                                                   background_genes, attr_ref_path,
                                                                   biotype_ref_path, save_csv, fname,
                                                                   return_fig, plot_log_scale, plot_style,
-                                                                  n_bins, self.set_name, parallel=False,
+                                                                  n_bins, self.set_name, parallel=parallel,
                                                                   parametric_test=parametric_test)
         if gui_mode:
             return runner.run(plot=False), runner
         return runner.run()
 
-    def biotypes(self, ref: Union[str, Path, Literal['predefined']] = 'predefined'):
+    def biotypes(self, ref: Union[str, Path, Literal['predefined']] = 'predefined', include_missing: bool = True):
 
         """
         Returns a DataFrame of the biotypes in the gene set and their count.
@@ -916,6 +955,10 @@ class FeatureSet:
         :type ref: str or pathlib.Path (default='predefined')
         :param ref: Path of the reference file used to determine biotype. \
         Default is the path predefined in the settings file.
+        :type include_missing: bool (default=True)
+        :param include_missing: if True, features which do not appear in the Biotype Reference Table \
+        will be counted under '_missing_from_biotype_reference', and a warning will be issued. \
+        Otherwise, such features will be silently ignored.
 
         :Examples:
             >>> from rnalysis import enrichment, filtering
@@ -931,15 +974,18 @@ class FeatureSet:
         """
 
         ref = settings.get_biotype_ref_path(ref)
-        ref_df = io.load_csv(ref)
+        ref_df = io.load_reference_table(ref)
         validation.validate_biotype_table(ref_df)
         ref_df.columns = ref_df.columns.str.lower()
-        not_in_ref = pd.Index(self.gene_set).difference(set(ref_df['gene']))
-        if len(not_in_ref) > 0:
-            warnings.warn(
-                f'{len(not_in_ref)} of the features in the Filter object do not appear in the Biotype Reference Table. ')
-            ref_df = ref_df.append(pd.DataFrame({'gene': not_in_ref, 'biotype': '_missing_from_biotype_reference'}))
-        return ref_df.set_index('gene', drop=False).loc[self.gene_set].groupby('biotype').count()
+        in_ref = ref_df['gene'].isin(self.gene_set)
+        biotype_counts = ref_df.loc[in_ref, 'biotype'].value_counts()
+        if include_missing:
+            n_not_in_ref = len(self.gene_set) - ref_df.loc[in_ref, 'gene'].nunique()
+            if n_not_in_ref > 0:
+                warnings.warn(
+                    f'{n_not_in_ref} of the features in the Filter object do not appear in the Biotype Reference Table. ')
+                biotype_counts['_missing_from_biotype_reference'] = n_not_in_ref
+        return biotype_counts.sort_index().rename_axis('biotype').to_frame('gene')
 
 
 class RankedSet(FeatureSet):
@@ -952,12 +998,12 @@ class RankedSet(FeatureSet):
 
     def __init__(self, ranked_genes: Union[Filter, List[str], Tuple[str], np.ndarray], set_name: str = ''):
 
-        if validation.isinstanceinh(ranked_genes, Filter):
-            self.ranked_genes = ranked_genes.df.index.values.astype('str', copy=True)
-        elif isinstance(ranked_genes, (list, tuple)):
+        if isinstance(ranked_genes, Filter):
+            # converting the index values always allocates a new array, so there is no need to copy it again
+            self.ranked_genes = ranked_genes.df.index.values.astype('str', copy=False)
+        elif isinstance(ranked_genes, (list, tuple, np.ndarray)):
+            # arrays supplied by the caller are copied, so that later changes to them do not affect the ranking
             self.ranked_genes = np.array(ranked_genes, dtype='str')
-        elif isinstance(ranked_genes, np.ndarray):
-            self.ranked_genes = ranked_genes.astype('str', copy=True)
         elif isinstance(ranked_genes, set):
             raise TypeError("'ranked_genes' must be an array, list, tuple or Filter object, sorted by rank. "
                             "Python sets are not a valid type ofr 'ranked_genes'.")
@@ -967,12 +1013,15 @@ class RankedSet(FeatureSet):
             raise TypeError(f"'ranked_genes' must be an array, list, tuple or Filter object, sorted by rank. "
                             f"Instead got {type(ranked_genes)}.")
 
+        # the RankedSet owns its ranking array and makes it read-only, so that copies can share it
+        self.ranked_genes.flags.writeable = False
+
         super().__init__(ranked_genes, set_name)
         assert len(self.ranked_genes) == len(self.gene_set), f"'ranked_genes' must have no repeating elements!"
 
     def __copy__(self):
         obj = type(self).__new__(type(self))
-        obj.ranked_genes = self.ranked_genes.copy()
+        obj.ranked_genes = self.ranked_genes.view()
         obj.gene_set = self.gene_set.copy()
         obj.set_name = self.set_name
         return obj
@@ -987,10 +1036,8 @@ class RankedSet(FeatureSet):
         if self.set_name != other.set_name:
             return False
 
-        if len(self.ranked_genes) != len(other.ranked_genes) or not np.all(self.ranked_genes == other.ranked_genes):
-            return False
-
-        return True
+        return self.ranked_genes.shape == other.ranked_genes.shape and \
+            np.array_equal(self.ranked_genes, other.ranked_genes)
 
     def _set_ops(self, others: Union[set, 'FeatureSet'], op: types.FunctionType):
         warnings.warn("Warning: when performing set operations with RankedSet objects, "
@@ -1330,11 +1377,24 @@ def plot_enrichment_results(results_df: pd.DataFrame, alpha=0.05, en_score_col:
     :return: Figure object containing the bar plot
     :rtype: matplotlib.figure.Figure instance
     """
-    runner = enrichment_runner.EnrichmentRunner(set(), results_df.index, alpha, '', True, False, '', True,
-                                                plot_horizontal, '', False, 'hypergeometric', 'all')
-    runner.en_score_col = en_score_col
-    runner.results = results_df
-    return runner.enrichment_bar_plot(name_col=name_col, center_bars=center_bars, ylabel=ylabel, title=title)
+    return enrichment_runner.enrichment_bar_plot(results_df, en_score_col, alpha, plot_horizontal, name_col=name_col,
+                                                 center_bars=center_bars, ylabel=ylabel, title=title)
+
+
+def _get_pvalue_kwargs(statistical_test: str, **randomization_kwargs) -> dict:
+    """
+    Returns the key-worded arguments to be passed to an enrichment runner's p-value function \
+    for the given statistical test.
+
+    :param statistical_test: name of the statistical test
+    :type statistical_test: str
+    :param randomization_kwargs: key-worded arguments that are only used by the randomization test
+    :return: a dictionary of key-worded arguments for the p-value function
+    :rtype: dict
+    """
+    if statistical_test.lower() == 'randomization':
+        return randomization_kwargs
+    return {}
 
 
 def _fetch_sets(objs: dict, ref: Union[str, Path, Literal['predefined']] = 'predefined'):
@@ -1354,19 +1414,20 @@ def _fetch_sets(objs: dict, ref: Union[str, Path, Literal['predefined']] = 'pred
     fetched_sets = dict()
 
     if validation.isinstanceiter_any(objs.values(), str):
-        attr_ref_table = io.load_csv(settings.get_attr_ref_path(ref))
+        attr_ref_table = io.load_reference_table(settings.get_attr_ref_path(ref))
         validation.validate_attr_table(attr_ref_table)
         attr_ref_table.set_index('gene', inplace=True)
 
     for set_name, set_obj in zip(objs.keys(), objs.values()):
         if isinstance(objs[set_name], (set, list, tuple)):
             fetched_sets[set_name] = parsing.data_to_set(set_obj)
-        elif validation.isinstanceinh(set_obj, Filter):
+        elif isinstance(set_obj, Filter):
             fetched_sets[set_name] = set_obj.index_set
-        elif validation.isinstanceinh(set_obj, FeatureSet):
+        elif isinstance(set_obj, FeatureSet):
             fetched_sets[set_name] = set_obj.gene_set
         elif isinstance(set_obj, str):
-            fetched_sets[set_name] = set(attr_ref_table[set_obj].loc[attr_ref_table[set_obj].notna()].index)
+            is_annotated = ~pd.isna(attr_ref_table[set_obj].to_numpy())
+            fetched_sets[set_name] = set(attr_ref_table.index.to_numpy()[is_annotated].tolist())
         else:
             raise TypeError(f"Invalid type for the set '{set_name}': {set_obj}.")
 
@@ -1428,11 +1489,9 @@ def upset_plot(objs: Dict[str, Union[str, FeatureSet, Set[str]]], set_colors: It
         color = set_colors[main_set]
         axes['totals'].patches[main_set].set_facecolor(color)
 
-    patcn_ids = _get_tuple_patch_ids(len(objs))
-    for subset in range(len(upset_obj.subset_styles)):
-        id = patcn_ids[subset]
-        colors_to_mix = [set_colors[ind] for ind, is_present in enumerate(id) if is_present]
-        color = generic.mix_colors(*colors_to_mix)
+    patcn_ids = parsing.generate_patch_ids(len(objs), sort_by_size=True)
+    subset_colors = generic.mix_colors_by_membership(patcn_ids[:len(upset_obj.subset_styles)], set_colors)
+    for subset, color in enumerate(map(tuple, subset_colors.tolist())):
         upset_obj.subset_styles[subset]['facecolor'] = color
         axes['intersections'].patches[subset].set_facecolor(color)
     matrix_ax = axes['matrix']
@@ -1442,25 +1501,33 @@ def upset_plot(objs: Dict[str, Union[str, FeatureSet, Set[str]]], set_colors: It
     return upset_obj
 
 
-def _compare_ids(id1: Tuple[int, ...], id2: Tuple[int, ...]):
-    if sum(id1) > sum(id2):
-        return 1
-    elif sum(id1) < sum(id2):
-        return -1
-    else:
-        for i in range(len(id1), 0, -1):
-            ind = i - 1
-            if id1[ind] > id2[ind]:
-                return 1
-            elif id1[ind] < id2[ind]:
-                return -1
-        return 0
-
-
-def _get_tuple_patch_ids(n_sets: int) -> List[Tuple[int, ...]]:
-    unsorted_ids = list(itertools.product([0, 1], repeat=n_sets))[1:]
-    sorted_ids = sorted(unsorted_ids, key=functools.cmp_to_key(_compare_ids))
-    return sorted_ids
+def _draw_venn_outline(ax: plt.Axes, plot_obj, linecolor: str, linestyle: str, linewidth: float) -> tuple:
+    # draws the outline circles from the layout that was already calculated for the Venn diagram,
+    # instead of calculating the same layout again through matplotlib_venn's venn2_circles()/venn3_circles()
+    circles = []
+    for center, radius in zip(plot_obj.centers, plot_obj.radii):
+        # matplotlib_venn>=1.0 stores the circle centers as Point2D objects instead of arrays
+        center = center.asarray() if hasattr(center, 'asarray') else center
+        circle = matplotlib.patches.Circle(center, radius, alpha=1.0, edgecolor=linecolor, facecolor='none',
+                                           linestyle=linestyle, linewidth=linewidth)
+        ax.add_patch(circle)
+        circles.append(circle)
+    return tuple(circles)
+
+
+def _draw_venn_region_outlines(ax: plt.Axes, plot_obj, linecolor: str, linestyle: str, linewidth: float) -> tuple:
+    # unweighted diagrams are outlined region by region, using unfilled copies of the regions that were already drawn
+    outlines = []
+    for patch in plot_obj.patches:
+        # regions of empty subsets are not drawn at all
+        if patch is None:
+            continue
+        path = patch.get_path().transformed(patch.get_patch_transform())
+        outline = matplotlib.patches.PathPatch(path, fill=False, edgecolor=linecolor, linestyle=linestyle,
+                                               linewidth=linewidth)
+        ax.add_patch(outline)
+        outlines.append(outline)
+    return tuple(outlines)
 
 
 def venn_diagram(objs: Dict[str, Union[str, FeatureSet, Set[str]]], title: Union[str, Literal['default']] = 'default',
@@ -1509,7 +1576,8 @@ def venn_diagram(objs: Dict[str, Union[str, FeatureSet, Set[str]]], title: Union
     :param normalize_to: the total (on-axes) area of the circles to be drawn. Sometimes tuning it (together
     with the overall fiture size) may be useful to fit the text labels better.
     :type normalize_to: float (default=1.0)
-    :return: a tuple of a VennDiagram object; and a list of 2-3 Circle patches.
+    :return: a tuple of a VennDiagram object; and a tuple of the outline patches \
+    (2-3 Circle patches if the plot is weighted, or the outline of every region if it is not).
 
 
         .. figure:: /figures/venn.png
@@ -1521,6 +1589,8 @@ def venn_diagram(objs: Dict[str, Union[str, FeatureSet, Set[str]]], title: Union
     if len(objs) > 3 or len(objs) < 2:
         raise ValueError(f'Venn can only accept between 2 and 3 sets. Instead got {len(objs)}')
     assert isinstance(title, str), f'Title must be a string. Instead got {type(title)}'
+    # matplotlib_venn is slow to import, and is only needed here
+    import matplotlib_venn as vn
     objs = _fetch_sets(objs=objs, ref=attr_ref_table_path)
     set_colors = parsing.data_to_tuple(set_colors)
     if len(set_colors) == 1:
@@ -1528,37 +1598,27 @@ def venn_diagram(objs: Dict[str, Union[str, FeatureSet, Set[str]]], title: Union
 
     if len(objs) == 2:
         func = vn.venn2 if weighted else vn.venn2_unweighted
-        func_circles = vn.venn2_circles
         set_colors = set_colors[0:2]
     else:
         func = vn.venn3 if weighted else vn.venn3_unweighted
-        func_circles = vn.venn3_circles
         set_colors = set_colors[0:3]
     if fig is None:
         fig = plt.figure()
     ax = fig.add_subplot()
-    plot_obj = func(tuple(objs.values()), tuple(objs.keys()), set_colors=set_colors, alpha=transparency,
+    subset_sizes = parsing.venn_region_sizes(list(objs.values()))
+    plot_obj = func(subset_sizes, tuple(objs.keys()), set_colors=set_colors, alpha=transparency,
                     normalize_to=normalize_to, ax=ax)
     if add_outline and weighted:
-        circle_obj = func_circles(tuple(objs.values()), color=linecolor, linestyle=linestyle, linewidth=linewidth,
-                                  normalize_to=normalize_to, ax=ax)
+        circle_obj = _draw_venn_outline(ax, plot_obj, linecolor, linestyle, linewidth)
     elif add_outline and not weighted:
-        circle_obj = func(tuple(objs.values()), tuple(objs.keys()), alpha=1, normalize_to=normalize_to, ax=ax)
-        for patch in circle_obj.patches:
-            patch.set_edgecolor(linecolor)
-            patch.set_linewidth(linewidth)
-            patch.set_linestyle(linestyle)
-            patch.set_fill(False)
+        circle_obj = _draw_venn_region_outlines(ax, plot_obj, linecolor, linestyle, linewidth)
     else:
         circle_obj = None
 
-    for label in plot_obj.set_labels:
-        label.set_fontsize(set_fontsize)
-    for sublabel in plot_obj.subset_labels:
-        if sublabel is not None:
-            sublabel.set_fontsize(subset_fontsize)
+    plt.setp(plot_obj.set_labels, fontsize=set_fontsize)
+    plt.setp([sublabel for sublabel in plot_obj.subset_labels if sublabel is not None], fontsize=subset_fontsize)
 
     if title == 'default':
-        title = 'Venn diagram of ' + ''.join([name + ' ' for name in objs.keys()])
+        title = 'Venn diagram of ' + ' '.join(objs.keys())
     ax.set_title(title, fontsize=title_fontsize)
     return plot_obj, circle_obj
@@ -369,6 +369,7 @@ class EnrichmentWindow(gui_widgets.MinMaxDialog):
                              None: {},
                              True: {'alpha'},
                              False: {'alpha'}}
+    ALL_STATISTICAL_TEST_ARGS = set.union(*STATISTICAL_TEST_ARGS.values())
 
     PLOT_ARGS = {'user_defined': {'plot_horizontal'},
                  'go': {'plot_horizontal', 'plot_ontology_graph', 'ontology_graph_format'},
@@ -385,6 +386,7 @@ class EnrichmentWindow(gui_widgets.MinMaxDialog):
         self.parameters_signature = {}
         self.stats_signature = {}
         self.plot_signature = {}
+        self._displayed_analysis = None
 
         self.scroll = QtWidgets.QScrollArea()
 
@@ -428,6 +430,11 @@ class EnrichmentWindow(gui_widgets.MinMaxDialog):
         self.scroll_layout.addWidget(self.parameter_group)
         self.scroll_layout.addWidget(self.plot_group)
 
+        self.widgets['help_link'] = QtWidgets.QLabel(self)
+        self.widgets['help_link'].setOpenExternalLinks(True)
+        self.widgets['help_link'].setVisible(False)
+        self.scroll_layout.addWidget(self.widgets['help_link'])
+
         self.widgets['run_button'] = QtWidgets.QPushButton('Run')
         self.widgets['run_button'].clicked.connect(self.run_analysis)
         self.widgets['run_button'].setVisible(False)
@@ -488,11 +495,17 @@ class EnrichmentWindow(gui_widgets.MinMaxDialog):
             self._set_background_select_mode(True)
 
     def update_uis(self):
+        analysis_type = self.get_current_analysis_type()
+        # re-clicking the current analysis type should not rebuild (and reset) the parameter widgets
+        displayed_analysis = (analysis_type, self.is_single_set())
+        if displayed_analysis == self._displayed_analysis:
+            return
+        self._displayed_analysis = displayed_analysis
+
         self.parameters_signature = {}
         self.stats_signature = {}
         self.plot_signature = {}
 
-        analysis_type = self.get_current_analysis_type()
         chosen_func = self.get_current_func()
         signature = generic.get_method_signature(chosen_func)
         func_desc, param_desc = io.get_method_docstring(chosen_func)
@@ -502,7 +515,7 @@ class EnrichmentWindow(gui_widgets.MinMaxDialog):
                 continue
             elif name in self.PLOT_ARGS[analysis_type]:
                 self.plot_signature[name] = (param, this_desc)
-            elif name in set.union(*self.STATISTICAL_TEST_ARGS.values()):
+            elif name in self.ALL_STATISTICAL_TEST_ARGS:
                 self.stats_signature[name] = (param, this_desc)
             else:
                 self.parameters_signature[name] = (param, this_desc)
@@ -513,17 +526,13 @@ class EnrichmentWindow(gui_widgets.MinMaxDialog):
         self.widgets['run_button'].setVisible(True)
         self.widgets['run_button'].setDisabled(True)
 
-        if 'help_link' in self.widgets:
-            self.scroll_layout.removeWidget(self.widgets['help_link'])
-            self.widgets['help_link'].deleteLater()
-        chosen_func_name = self.get_current_func().__name__
+        chosen_func_name = chosen_func.__name__
         obj_type = enrichment.RankedSet if self.is_single_set() else enrichment.FeatureSet
         help_address = f"https://guyteichman.github.io/RNAlysis/build/rnalysis.enrichment." \
                        f"{obj_type.__name__}.{chosen_func_name}.html"
-        self.widgets['help_link'] = QtWidgets.QLabel(f'<a href="{help_address}">Open documentation for function '
-                                                     f'<b>{obj_type.__name__}.{chosen_func_name}</b></a>')
-        self.widgets['help_link'].setOpenExternalLinks(True)
-        self.scroll_layout.insertWidget(4, self.widgets['help_link'])
+        self.widgets['help_link'].setText(f'<a href="{help_address}">Open documentation for function '
+                                          f'<b>{obj_type.__name__}.{chosen_func_name}</b></a>')
+        self.widgets['help_link'].setVisible(True)
 
         _, _, width, height = self.scroll.geometry().getRect()
         self.resize(width, 750)
@@ -543,7 +552,7 @@ class EnrichmentWindow(gui_widgets.MinMaxDialog):
         button = self.widgets['dataset_radiobox'].checkedButton()
         if button is None:
             return None
-        return self.ANALYSIS_TYPES[self.widgets['dataset_radiobox'].checkedButton().text()]
+        return self.ANALYSIS_TYPES[button.text()]
 
     def get_current_func(self):
         single_set = self.is_single_set()
@@ -602,7 +611,6 @@ class EnrichmentWindow(gui_widgets.MinMaxDialog):
                                                  self.ORDINAL_STATISTICAL_TESTS.keys())
         self.stats_widgets['stats_radiobox'] = gui_widgets.RadioButtonBox('Choose statistical test:', radio_options)
         self.stats_widgets['stats_radiobox'].selectionChanged.connect(self._verify_inputs)
-        self.stats_widgets['stats_radiobox'].buttonClicked.connect(self._verify_inputs)
         if prev_test_name is not None:
             self.stats_widgets['stats_radiobox'].set_selection(prev_test_name)
         self.stats_widgets['stats_radiobox'].buttonClicked.connect(self.update_stats_ui)
@@ -702,7 +710,7 @@ class SetOperationWindow(gui_widgets.MinMaxDialog):
         self.list_group = QtWidgets.QGroupBox('Choose gene sets', self)
         self.list_grid = QtWidgets.QGridLayout(self.list_group)
         self.parameter_group = QtWidgets.QGroupBox('Additional parameters', self)
-        self.parameter_grid = QtWidgets.QGridLayout(self.parameter_group)
+        self.parameter_grid = QtWidgets.QFormLayout(self.parameter_group)
         self.parameter_widgets = {}
         self.operations_group = QtWidgets.QGroupBox('Set operation')
         self.operations_grid = QtWidgets.QGridLayout(self.operations_group)
@@ -711,15 +719,15 @@ class SetOperationWindow(gui_widgets.MinMaxDialog):
         self.init_ui()
 
     def create_canvas(self):
-        set_names = [item.text() for item in self.widgets['set_list'].get_sorted_selection()]
-        sets = [self.available_objects[name][0].obj() for name in set_names]
-        ind = 0
-        while ind < len(set_names):
-            if sets[ind] is None or self.available_objects[set_names[ind]][0].is_empty():
-                set_names.pop(ind)
-                sets.pop(ind)
-            else:
-                ind += 1
+        set_names = []
+        sets = []
+        # skip gene sets that are missing or empty
+        for item in self.widgets['set_list'].get_sorted_selection():
+            tab = self.available_objects[item.text()][0]
+            this_set = tab.obj()
+            if this_set is not None and not tab.is_empty():
+                set_names.append(item.text())
+                sets.append(this_set)
 
         if len(set_names) < 2:
             canvas = gui_graphics.EmptyCanvas('Please select 2 or more gene sets to continue', self)
@@ -804,9 +812,13 @@ class SetOperationWindow(gui_widgets.MinMaxDialog):
             self.widgets['choose_primary_set'].setVisible(True)
             self.widgets['choose_primary_set_label'].setVisible(True)
 
-            self.widgets['choose_primary_set'].clear()
-            self.widgets['choose_primary_set'].addItems(
-                [item.text() for item in self.widgets['set_list'].get_sorted_selection()])
+            # refill the combo box silently, then notify its listeners once about the resulting choice
+            with QtCore.QSignalBlocker(self.widgets['choose_primary_set']):
+                self.widgets['choose_primary_set'].clear()
+                self.widgets['choose_primary_set'].addItems(
+                    [item.text() for item in self.widgets['set_list'].get_sorted_selection()])
+            self.widgets['choose_primary_set'].currentTextChanged.emit(
+                self.widgets['choose_primary_set'].currentText())
             self.widgets['canvas'].clear_selection()
         else:
             self.widgets['choose_primary_set'].setVisible(False)
@@ -820,7 +832,6 @@ class SetOperationWindow(gui_widgets.MinMaxDialog):
                                                                       self.SET_OPERATIONS.keys())
 
         for func in [self.update_paremeter_ui, self._validate_input, self._toggle_choose_primary_set]:
-            self.widgets['radio_button_box'].buttonClicked.connect(func)
             self.widgets['radio_button_box'].selectionChanged.connect(func)
         self.widgets['radio_button_box'].radio_buttons['Majority-Vote Intersection'].clicked.connect(
             self._majority_vote_intersection)
@@ -836,6 +847,11 @@ class SetOperationWindow(gui_widgets.MinMaxDialog):
 
         self.widgets['set_op_box_layout'].addStretch(1)
 
+        self.widgets['help_link'] = QtWidgets.QLabel(self)
+        self.widgets['help_link'].setOpenExternalLinks(True)
+        self.widgets['help_link'].setVisible(False)
+        self.operations_grid.addWidget(self.widgets['help_link'], 5, 0, 1, 6)
+
         self._toggle_choose_primary_set()
 
         self.create_canvas()
@@ -864,38 +880,29 @@ class SetOperationWindow(gui_widgets.MinMaxDialog):
 
     def update_paremeter_ui(self):
         # delete previous widgets
-        try:
-            self.parameter_widgets['help_link'].deleteLater()
-            self.operations_grid.removeWidget(self.parameter_widgets['help_link'])
-        except KeyError:
-            pass
         self.parameter_widgets = {}
-        gui_widgets.clear_layout(self.parameter_grid)
+        while self.parameter_grid.rowCount() > 0:
+            self.parameter_grid.removeRow(0)
 
         chosen_func_name = self.get_current_func_name()
         signature = generic.get_method_signature(chosen_func_name, filtering.Filter)
-        i = 0
         for name, param in signature.items():
             if name in self.EXCLUDED_PARAMS:
                 continue
             self.parameter_widgets[name] = gui_widgets.param_to_widget(param, name)
-            self.parameter_grid.addWidget(QtWidgets.QLabel(f'{name}:', self.parameter_widgets[name]), i, 0)
-            self.parameter_grid.addWidget(self.parameter_widgets[name], i, 1)
+            self.parameter_grid.addRow(f'{name}:', self.parameter_widgets[name])
             if chosen_func_name == 'majority_vote_intersection':
                 self.parameter_widgets[name].valueChanged.connect(self._majority_vote_intersection)
                 self._majority_vote_intersection()
-            i += 1
 
-        self.parameter_group.setVisible(i > 0)
+        self.parameter_group.setVisible(self.parameter_grid.rowCount() > 0)
 
         if chosen_func_name != 'other':
             help_address = f"https://guyteichman.github.io/RNAlysis/build/rnalysis.filtering." \
                            f"{filtering.Filter.__name__}.{chosen_func_name}.html"
-            self.parameter_widgets['help_link'] = QtWidgets.QLabel(
-                f'<a href="{help_address}">Open documentation for function '
-                f'<b>{filtering.Filter.__name__}.{chosen_func_name}</b></a>', self)
-            self.parameter_widgets['help_link'].setOpenExternalLinks(True)
-            self.operations_grid.addWidget(self.parameter_widgets['help_link'], 5, 0, 1, 6)
+            self.widgets['help_link'].setText(f'<a href="{help_address}">Open documentation for function '
+                                              f'<b>{filtering.Filter.__name__}.{chosen_func_name}</b></a>')
+        self.widgets['help_link'].setVisible(chosen_func_name != 'other')
 
     def get_current_func_name(self):
         button = self.widgets['radio_button_box'].checkedButton()
@@ -936,8 +943,6 @@ class SetOperationWindow(gui_widgets.MinMaxDialog):
             primary_set_name = set_names[0]
         kwargs = {}
         for param_name, widget in self.parameter_widgets.items():
-            if param_name in {'apply_button', 'help_link'}:
-                continue
             val = gui_widgets.get_val_from_widget(widget)
 
             kwargs[param_name] = val
@@ -953,8 +958,6 @@ class SetOperationWindow(gui_widgets.MinMaxDialog):
             set_names, primary_set_name, kwargs = self._get_function_params()
 
             first_obj = self.available_objects[primary_set_name][0].obj()
-            if isinstance(first_obj, set):
-                first_obj = filtering.Filter.from_dataframe(pd.DataFrame(index=list(first_obj)), 'placeholder')
             other_objs = []
             for name in set_names:
                 if name != primary_set_name:
@@ -966,6 +969,8 @@ class SetOperationWindow(gui_widgets.MinMaxDialog):
                                              f'Apply "{func_name}"')
                 self.available_objects[primary_set_name][0].undo_stack.push(command)
                 output_set = None
+            elif isinstance(first_obj, set):
+                output_set = self._apply_set_op_to_set(first_obj, func_name, other_objs, kwargs)
             else:
                 output_set = getattr(first_obj, func_name)(*other_objs, **kwargs)
 
@@ -973,6 +978,15 @@ class SetOperationWindow(gui_widgets.MinMaxDialog):
             self.geneSetReturned.emit(output_set, output_name)
         self.close()
 
+    @staticmethod
+    def _apply_set_op_to_set(first_set: set, func_name: str, other_objs: list, kwargs: dict) -> set:
+        # same result as the Filter set operation, without wrapping the primary gene set in a placeholder Filter
+        others = [obj.index_set if validation.isinstanceinh(obj, filtering.Filter) else obj for obj in other_objs]
+        if func_name == 'majority_vote_intersection':
+            return generic.SetWithMajorityVote.majority_vote_intersection(
+                first_set, *others, majority_threshold=kwargs.get('majority_threshold', 0.5))
+        return getattr(set, func_name)(first_set, *others)
+
 
 class SetVisualizationWindow(gui_widgets.MinMaxDialog):
     VISUALIZATION_FUNCS = {'Venn Diagram': 'venn_diagram', 'UpSet Plot': 'upset_plot'}
@@ -992,7 +1006,7 @@ class SetVisualizationWindow(gui_widgets.MinMaxDialog):
 
         self.parameter_widgets = {}
         self.parameter_group = QtWidgets.QGroupBox('Additional parameters')
-        self.parameter_grid = QtWidgets.QGridLayout(self.parameter_group)
+        self.parameter_grid = QtWidgets.QFormLayout(self.parameter_group)
 
         self.init_ui()
 
@@ -1027,7 +1041,6 @@ class SetVisualizationWindow(gui_widgets.MinMaxDialog):
         self.widgets['radio_button_box'] = gui_widgets.RadioButtonBox('Choose visualization type:',
                                                                       self.VISUALIZATION_FUNCS, parent=self)
         for func in [self.update_parameter_ui, self._validate_input, self.create_canvas]:
-            self.widgets['radio_button_box'].buttonClicked.connect(func)
             self.widgets['radio_button_box'].selectionChanged.connect(func)
 
         self.visualization_grid.addWidget(self.widgets['radio_button_box'], 0, 0, 2, 1)
@@ -1039,18 +1052,20 @@ class SetVisualizationWindow(gui_widgets.MinMaxDialog):
         self.widgets['generate_button'].setEnabled(False)
         self.visualization_grid.addWidget(self.widgets['generate_button'], 4, 0, 1, 5)
 
+        self.widgets['help_link'] = QtWidgets.QLabel(self)
+        self.widgets['help_link'].setOpenExternalLinks(True)
+        self.widgets['help_link'].setVisible(False)
+        self.visualization_grid.addWidget(self.widgets['help_link'], 5, 0, 1, 4)
+
         self.create_canvas()
 
     def create_canvas(self):
-        set_names = [item.text() for item in self.widgets['set_list'].get_sorted_selection()]
-        sets = [self.available_objects[name][0].obj() for name in set_names]
-        ind = 0
-        while ind < len(set_names):
-            if sets[ind] is None or self.available_objects[set_names[ind]][0].is_empty():
-                set_names.pop(ind)
-                sets.pop(ind)
-            else:
-                ind += 1
+        set_names = []
+        # skip gene sets that are missing or empty
+        for item in self.widgets['set_list'].get_sorted_selection():
+            tab = self.available_objects[item.text()][0]
+            if tab.obj() is not None and not tab.is_empty():
+                set_names.append(item.text())
 
         func_name = self.get_current_func_name()
 
@@ -1097,34 +1112,25 @@ class SetVisualizationWindow(gui_widgets.MinMaxDialog):
 
     def update_parameter_ui(self):
         # delete previous widgets
-        try:
-            self.parameter_widgets['help_link'].deleteLater()
-            self.visualization_grid.removeWidget(self.parameter_widgets['help_link'])
-        except KeyError:
-            pass
         self.parameter_widgets = {}
-        gui_widgets.clear_layout(self.parameter_grid)
+        while self.parameter_grid.rowCount() > 0:
+            self.parameter_grid.removeRow(0)
 
         chosen_func_name = self.get_current_func_name()
         signature = generic.get_method_signature(chosen_func_name, enrichment)
-        i = 0
         for name, param in signature.items():
             if name in self.EXCLUDED_PARAMS:
                 continue
             self.parameter_widgets[name] = gui_widgets.param_to_widget(param, name,
                                                                        actions_to_connect=self.create_canvas)
-            self.parameter_grid.addWidget(QtWidgets.QLabel(f'{name}:', self.parameter_widgets[name]), i, 0)
-            self.parameter_grid.addWidget(self.parameter_widgets[name], i, 1)
-            i += 1
+            self.parameter_grid.addRow(f'{name}:', self.parameter_widgets[name])
 
         help_address = f"https://guyteichman.github.io/RNAlysis/build/rnalysis.enrichment.{chosen_func_name}.html"
-        self.parameter_widgets['help_link'] = QtWidgets.QLabel(
-            f'<a href="{help_address}">Open documentation for function '
-            f'<b>enrichment.{chosen_func_name}</b></a>', self)
-        self.parameter_widgets['help_link'].setOpenExternalLinks(True)
-        self.visualization_grid.addWidget(self.parameter_widgets['help_link'], 5, 0, 1, 4)
+        self.widgets['help_link'].setText(f'<a href="{help_address}">Open documentation for function '
+                                          f'<b>enrichment.{chosen_func_name}</b></a>')
+        self.widgets['help_link'].setVisible(True)
 
-        self.parameter_group.setVisible(i > 0)
+        self.parameter_group.setVisible(self.parameter_grid.rowCount() > 0)
 
     def get_current_func_name(self):
         button = self.widgets['radio_button_box'].checkedButton()
@@ -1138,8 +1144,6 @@ class SetVisualizationWindow(gui_widgets.MinMaxDialog):
                         not self.available_objects[name][0].is_empty()}
         kwargs = {}
         for param_name, widget in self.parameter_widgets.items():
-            if param_name in {'apply_button', 'help_link'}:
-                continue
             val = gui_widgets.get_val_from_widget(widget)
 
             kwargs[param_name] = val
@@ -3023,17 +3027,14 @@ class MainWindow(QtWidgets.QMainWindow):
 
     def get_available_objects(self):
         tab_names = self.get_tab_names()
-        checked = {}
+        name_counts = {}
         available_objects_unique = {}
         for i, name in enumerate(tab_names):
-            if name in checked:
-                key = f"{name}_{checked[name]}"
-
-            else:
-                checked[name] = 1
-                key = name
+            count = name_counts.get(name, 0)
+            # repeated tab names are numbered by their occurrence, starting from '_2'
+            key = f"{name}_{count + 1}" if count > 0 else name
             available_objects_unique[key] = (self.tabs.widget(i), self.tabs.tabIcon(i))
-            checked[name] += 1
+            name_counts[name] = count + 1
         return available_objects_unique
 
     def get_gene_set_by_name(self, name: str):
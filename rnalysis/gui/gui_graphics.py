@@ -1,5 +1,3 @@
-import functools
-import itertools
 from typing import List, Tuple, Callable
 
 from pathlib import Path
@@ -115,8 +113,10 @@ class VennInteractiveCanvas(BaseInteractiveCanvas):
         else:
             raise ValueError("Cannot proccess more than 3 sets!")
 
-        self.venn = funcs[0](gene_sets.values(), gene_sets.keys(), set_colors=colors, ax=self.ax, alpha=1)
-        self.venn_circles = funcs[1](gene_sets.values(), linestyle='solid', linewidth=2.0, ax=self.ax)
+        # the subset sizes are calculated once, and then reused for drawing both the diagram and its outline
+        subset_sizes = parsing.venn_region_sizes(list(gene_sets.values()))
+        self.venn = funcs[0](subset_sizes, gene_sets.keys(), set_colors=colors, ax=self.ax, alpha=1)
+        self.venn_circles = funcs[1](subset_sizes, linestyle='solid', linewidth=2.0, ax=self.ax)
         self.default_subset_fontsize = 14
         self.states = [self.DESELECTED_STATE for _ in range(len(self.venn.patches))]
         self.set_font_size(16, self.default_subset_fontsize)
@@ -205,7 +205,7 @@ class VennInteractiveCanvas(BaseInteractiveCanvas):
         self.draw()
 
     def get_tuple_patch_ids(self) -> List[Tuple[int, ...]]:
-        return list(itertools.product([0, 1], repeat=len(self.gene_sets)))[1:]
+        return list(parsing.generate_patch_ids(len(self.gene_sets)))
 
     @QtCore.pyqtSlot()
     def union(self):
@@ -332,25 +332,8 @@ class UpSetInteractiveCanvas(BaseInteractiveCanvas):
 
         return graph_modified
 
-    @staticmethod
-    def _compare_ids(id1: Tuple[int, ...], id2: Tuple[int, ...]):
-        if sum(id1) > sum(id2):
-            return 1
-        elif sum(id1) < sum(id2):
-            return -1
-        else:
-            for i in range(len(id1), 0, -1):
-                ind = i - 1
-                if id1[ind] > id2[ind]:
-                    return 1
-                elif id1[ind] < id2[ind]:
-                    return -1
-            return 0
-
     def get_tuple_patch_ids(self) -> List[Tuple[int, ...]]:
-        unsorted_ids = list(itertools.product([0, 1], repeat=len(self.gene_sets)))[1:]
-        sorted_ids = sorted(unsorted_ids, key=functools.cmp_to_key(self._compare_ids))
-        return sorted_ids
+        return list(parsing.generate_patch_ids(len(self.gene_sets), sort_by_size=True))
 
     def select(self, ind, draw: bool = True):
         graph_modified = self.update_color(ind, self.SELECTED_STATE)
@@ -586,7 +586,8 @@ class MultipleChoiceList(QtWidgets.QWidget):
         return sorted(items, key=self.list.row)
 
     def get_sorted_selected_names(self):
-        return [name for name in self.items if name in {item.text() for item in self.list.selectedItems()}]
+        selected_names = {item.text() for item in self.list.selectedItems()}
+        return [name for name in self.items if name in selected_names]
 
     def get_sorted_names(self):
         return self.items
@@ -604,14 +605,11 @@ class MultipleChoiceList(QtWidgets.QWidget):
             self.add_item(item, None if icons is None else icons[i])
 
     def select_all(self):
-        for ind in range(self.list.count()):
-            item = self.list.item(ind)
-            if not item.isSelected():
-                item.setSelected(True)
+        # a single selection change, so listeners (e.g. canvas redraws) are only notified once
+        self.list.selectAll()
 
     def clear_all(self):
-        for item in self.list.selectedItems():
-            item.setSelected(False)
+        self.list.clearSelection()
 
 
 class MultiChoiceListWithDelete(MultipleChoiceList):
@@ -951,6 +949,7 @@ class RadioButtonBox(QtWidgets.QGroupBox):
         self.setFlat(is_flat)
         self.button_box = QtWidgets.QButtonGroup()
         self.buttonClicked = self.button_box.buttonClicked
+        self.buttonClicked.connect(self.selectionChanged.emit)
         self.checkedButton = self.button_box.checkedButton
         self.radio_layout = QtWidgets.QGridLayout()
         self.radio_buttons = {}
@@ -985,7 +984,6 @@ class RadioButtonBox(QtWidgets.QGroupBox):
             for i, button in enumerate(self.radio_buttons.values()):
                 if i == selection:
                     button.click()
-        self.selectionChanged.emit()
 
 
 class SpinBoxWithDisable(QtWidgets.QSpinBox):
@@ -1,4 +1,5 @@
 import collections
+import hashlib
 import io as builtin_io
 import itertools
 import logging
@@ -17,10 +18,12 @@ import numpy as np
 import pandas as pd
 import statsmodels.stats.multitest as multitest
 from matplotlib.cm import ScalarMappable
-from scipy.stats import hypergeom, ttest_1samp, fisher_exact
+from scipy.special import gammaln
+from scipy.stats import hypergeom, ttest_1samp
 from statsmodels.stats.descriptivestats import sign_test
 from tqdm.auto import tqdm
 
+from rnalysis import __version__
 from rnalysis.utils import ontology, io, parsing, settings, validation, generic
 
 try:
@@ -53,6 +56,176 @@ def does_python_version_support_single_set():
 XLMHG_SUPPORTED = does_python_version_support_single_set()
 
 
+@lru_cache(maxsize=8)
+def _get_biotype_background_set(biotype_ref_path: Path, mtime: int, biotypes: Tuple[str, ...]) -> frozenset:
+    # 'mtime' is only part of the cache key, so that the background set is generated again if the table was modified
+    biotype_ref_df = io.load_reference_table(biotype_ref_path)
+    validation.validate_biotype_table(biotype_ref_df)
+    genes = biotype_ref_df['gene'].to_numpy()
+    biotype_arr = biotype_ref_df['biotype'].to_numpy()
+    if len(biotypes) == 1:
+        mask = biotype_arr == biotypes[0]
+    else:
+        mask = np.isin(biotype_arr, biotypes)
+    return frozenset(genes[mask])
+
+
+def _get_annotation_cache_filename(prefix: str, query_key) -> str:
+    # the RNAlysis version is part of the key, so that annotations processed by older versions are not reused
+    key_hash = hashlib.blake2b(repr((__version__, query_key)).encode(), digest_size=16).hexdigest()
+    return f'{prefix}_{key_hash}.pkl'
+
+
+@lru_cache(maxsize=4)
+def _get_log_factorials(n: int) -> np.ndarray:
+    # table of log(k!) for k = 0...n, shared by all Fisher's exact tests with the same background size
+    log_fact = gammaln(np.arange(n + 1) + 1)
+    log_fact.flags.writeable = False
+    return log_fact
+
+
+def enrichment_bar_plot(results_df: pd.DataFrame, en_score_col: str, alpha: float, plot_horizontal: bool = True,
+                        n_bars: int = 'all', name_col: str = None, center_bars: bool = True,
+                        ylabel: str = r"$\log_2$(Fold Enrichment)", title: str = 'Enrichment results') -> plt.Figure:
+    """
+    Receives a DataFrame output from an enrichment function and plots it in a bar plot. \
+    For the clarity of display, complete depletion (linear enrichment = 0) \
+    appears with the smallest value in the scale.
+
+    :param results_df: DataFrame containing enrichment analysis results.
+    :type results_df: pandas DataFrame
+    :param en_score_col: name of the enrichment score column in the results DataFrame.
+    :type en_score_col: str
+    :param alpha: the statistical significance threshold.
+    :type alpha: float
+    :param plot_horizontal: if True, results will be plotted with a horizontal bar plot. \
+    Otherwise, results will be plotted with a vertical plot.
+    :type plot_horizontal: bool (default=True)
+    :param n_bars: number of bars to plot (the top results), or 'all' to plot all of the results.
+    :type n_bars: int or 'all' (default='all')
+    :param name_col: name of the column containing the names of the results. \
+    If None, the index of the results DataFrame will be used.
+    :type name_col: str or None (default=None)
+    :param center_bars: if True, centers the bars around Y=0. Otherwise, ylim is determined by min/max values.
+    :type center_bars: bool (default True)
+    :param ylabel: plot ylabel.
+    :type ylabel: str
+    :param title: plot title.
+    :type title: str
+    :return: Figure object containing the bar plot
+    :rtype: matplotlib.figure.Figure instance
+    """
+    plt.style.use('seaborn-white')
+    # determine number of entries/bars to plot
+    if n_bars != 'all':
+        assert isinstance(n_bars, int)
+        if n_bars < 1:
+            return
+        results = results_df.iloc[:n_bars]
+    else:
+        results = results_df
+    # pull names/scores/pvals out to avoid accidentally changing the results DataFrame in-place
+    enrichment_names = results.index.values.tolist() if name_col is None else results[name_col].values.tolist()
+    enrichment_scores = results[en_score_col].values.tolist()
+    enrichment_pvalue = results['padj'].values.tolist()
+
+    # choose functions and parameters according to the graph's orientation (horizontal vs vertical)
+    if plot_horizontal:
+        figsize = [10.5, 0.4 * (4.8 + results_df.shape[0])]
+        bar_func = plt.Axes.barh
+        line_func = plt.Axes.axvline
+        cbar_kwargs = dict(location='bottom')
+        tick_func = plt.Axes.set_yticks
+        ticklabels_func = plt.Axes.set_yticklabels
+        ticklabels_kwargs = dict(fontsize=13, rotation=0)
+        for lst in (enrichment_names, enrichment_scores, enrichment_pvalue):
+            lst.reverse()
+    else:
+        figsize = [0.5 * (4.8 + results_df.shape[0]), 4.2]
+        bar_func = plt.Axes.bar
+        line_func = plt.Axes.axhline
+        cbar_kwargs = dict(location='left')
+        tick_func = plt.Axes.set_xticks
+        ticklabels_func = plt.Axes.set_xticklabels
+        ticklabels_kwargs = dict(fontsize=13, rotation=45)
+
+    # set enrichment scores which are 'inf' or '-inf' to be the second highest/lowest enrichment score in the list
+    scores_no_inf = [i for i in enrichment_scores if i != np.inf and i != -np.inf and i < 0]
+    if len(scores_no_inf) == 0:
+        scores_no_inf.append(-1)
+    for i in range(len(enrichment_scores)):
+        if enrichment_scores[i] == -np.inf:
+            enrichment_scores[i] = min(scores_no_inf)
+    if len(enrichment_scores) > 3:
+        max_score = max(np.max(np.abs(enrichment_scores)), 2)
+    else:
+        max_score = 2
+
+    # get color values for bars
+    data_color_norm = [0.5 * (1 + i / (np.floor(max_score) + 1)) * 255 for i in enrichment_scores]
+    data_color_norm_8bit = [int(i) if i != np.inf and i != -np.inf else np.sign(i) * max(np.abs(scores_no_inf)) for
+                            i in data_color_norm]
+    my_cmap = plt.cm.get_cmap('coolwarm')
+    colors = my_cmap(data_color_norm_8bit)
+
+    # generate bar plot
+    fig, ax = plt.subplots(constrained_layout=True, figsize=figsize)
+    bar = bar_func(ax, range(len(enrichment_names)), enrichment_scores, color=colors, edgecolor='black',
+                   linewidth=1, zorder=2)
+    bar.tick_labels = enrichment_names
+    # determine bounds, and enlarge the bound by a small margin (0.2%) so nothing gets cut out of the figure
+    bounds = np.array([np.ceil(-max_score) - 1, (np.floor(max_score) + 1)]) * 1.002
+    # add black line at y=0 and grey lines at every round positive/negative integer in range
+    for ind in range(int(bounds[0]) + 1, int(bounds[1]) + 1):
+        color = 'black' if ind == 0 else 'grey'
+        linewidth = 1 if ind == 0 else 0.5
+        linestyle = '-' if ind == 0 else '-.'
+        line_func(ax, ind, color=color, linewidth=linewidth, linestyle=linestyle, zorder=0)
+    # add colorbar
+    sm = ScalarMappable(cmap=my_cmap, norm=plt.Normalize(*bounds))
+    sm.set_array(np.array([]))
+    cbar_label_kwargs = dict(label=ylabel, fontsize=16, labelpad=15)
+    cbar = fig.colorbar(sm, ticks=range(int(bounds[0]), int(bounds[1]) + 1), **cbar_kwargs)
+    cbar.set_label(**cbar_label_kwargs)
+    cbar.ax.tick_params(labelsize=14, pad=6)
+    # apply xticks
+    tick_func(ax, range(len(enrichment_names)))
+    ticklabels_func(ax, enrichment_names, **ticklabels_kwargs)
+    # title
+    ax.set_title(title, fontsize=18)
+    # add significance asterisks
+    for col, sig in zip(bar, enrichment_pvalue):
+        asterisks, fontweight = EnrichmentRunner._get_pval_asterisk(sig, alpha)
+        if plot_horizontal:
+            x = col._width
+            y = col.xy[1] + 0.5 * col._height
+            valign = 'center'
+            halign = 'left' if np.sign(col._width) == 1 else 'right'
+            rotation = 270 if np.sign(col._width) == 1 else 90
+        else:
+            x = col.xy[0] + 0.5 * col._width
+            y = col._height
+            valign = 'bottom' if np.sign(col._height) == 1 else 'top'
+            halign = 'center'
+            rotation = 0
+
+        ax.text(x=x, y=y, s=asterisks, fontname='DejaVu Sans', fontweight=fontweight, rotation=rotation,
+                fontsize=9, horizontalalignment=halign, verticalalignment=valign, zorder=1)
+    # despine
+    _ = [ax.spines[side].set_visible(False) for side in ['top', 'right']]
+    # center bars
+    if center_bars:
+        if plot_horizontal:
+            ax.set_xbound(bounds)
+            plt.tick_params(axis='x', which='both', bottom=False, top=False, labelbottom=False)
+        else:
+            ax.set_ybound(bounds)
+            plt.tick_params(axis='y', which='both', left=False, right=False, labelleft=False)
+
+    plt.show()
+    return fig
+
+
 class EnrichmentRunner:
     __slots__ = {'results': 'DataFrame containing enrichment analysis results',
                  'annotation_df': 'DataFrame containing all annotation data per gene',
@@ -78,7 +251,14 @@ class EnrichmentRunner:
                  'random_seed': 'random seed to be used when non-deterministic functions are used',
                  'en_score_col': 'name of the enrichment score column in the results DataFrame',
                  'ranked_genes': 'the set of genes/genomic features whose enrichment to calculate, '
-                                 'pre-sorted and ranked by the user'}
+                                 'pre-sorted and ranked by the user',
+                 'attr_counts': 'number of annotated genes per attribute in the background set and in the '
+                                'enrichment set, pre-calculated for all attributes at once',
+                 'attr_pvals': 'enrichment p-values per attribute, pre-calculated for all attributes at once',
+                 'ranked_annotations': 'annotation status of the ranked genes per attribute, ordered by rank and '
+                                       'pre-calculated for all attributes at once',
+                 'gene_list': 'the set of genes/genomic features whose enrichment to calculate, '
+                              'cached as a list (together with the set it was built from) for label-based indexing'}
     printout_params = "appear in the Attribute Reference Table"
 
     def __init__(self, genes: Union[set, np.ndarray], attributes: Union[Iterable, str, int], alpha: float,
@@ -88,6 +268,10 @@ class EnrichmentRunner:
                  random_seed: int = None, **pvalue_kwargs):
         self.results: pd.DataFrame = pd.DataFrame()
         self.annotation_df: pd.DataFrame = pd.DataFrame()
+        self.attr_counts = None
+        self.attr_pvals = None
+        self.ranked_annotations = None
+        self.gene_list = None
         self.gene_set = parsing.data_to_set(genes)
         self.attributes = attributes
         self.alpha = alpha
@@ -169,18 +353,10 @@ class EnrichmentRunner:
         if len(self.ranked_genes) == len(self.gene_set):
             return
         else:
-            ranked_genes = np.empty((len(self.gene_set),), dtype=self.ranked_genes.dtype)
-            processed_genes = set()
-            i = 0
-            for elem in self.ranked_genes:
-                if elem in self.gene_set and elem not in processed_genes:
-                    ranked_genes[i] = elem
-                    processed_genes.add(elem)
-                    i += 1
-
-                    if len(processed_genes) == len(self.gene_set):
-                        break
-            self.ranked_genes = ranked_genes
+            # keep only the first occurrence of every gene in the gene set, while preserving the original ranking
+            ranked_genes = self.ranked_genes[pd.Index(self.ranked_genes).isin(self.gene_set)]
+            _, first_occurrences = np.unique(ranked_genes, return_index=True)
+            self.ranked_genes = ranked_genes[np.sort(first_occurrences)]
 
     def results_to_csv(self):
         io.save_csv(self.results, filename=self.fname if self.fname.endswith('.csv') else self.fname + '.csv')
@@ -230,8 +406,11 @@ class EnrichmentRunner:
     def _get_hypergeometric_parameters(self, attribute: str) -> Tuple[int, int, int, int]:
         bg_size = self.annotation_df.shape[0]
         de_size = len(self.gene_set)
+        if self.attr_counts is not None and attribute in self.attr_counts:
+            go_size, go_de_size = self.attr_counts[attribute]
+            return bg_size, de_size, go_size, go_de_size
         go_size = self.annotation_df[attribute].notna().sum()
-        go_de_size = self.annotation_df.loc[list(self.gene_set), attribute].notna().sum()
+        go_de_size = self.annotation_df.loc[self._get_gene_list(), attribute].notna().sum()
         return bg_size, de_size, go_size, go_de_size
 
     def _get_xlmhg_parameters(self, index_vec):
@@ -277,10 +456,14 @@ class EnrichmentRunner:
 
     def _generate_xlmhg_index_vectors(self, attribute) -> Tuple[np.ndarray, np.ndarray]:
         n = len(self.ranked_genes)
-        ranked_srs = self.annotation_df.loc[self.ranked_genes, attribute]
-        assert ranked_srs.shape[0] == n
-        index_vec = np.uint16(np.nonzero(ranked_srs.notna().values)[0])
-        rev_index_vec = np.uint16([n - 1 - index_vec[i - 1] for i in range(len(index_vec), 0, -1)])
+        if self.ranked_annotations is not None and attribute in self.ranked_annotations:
+            is_annotated = self.ranked_annotations[attribute]
+        else:
+            ranked_srs = self.annotation_df.loc[self.ranked_genes, attribute]
+            assert ranked_srs.shape[0] == n
+            is_annotated = ranked_srs.notna().values
+        index_vec = np.uint16(np.nonzero(is_annotated)[0])
+        rev_index_vec = np.uint16(n - 1 - index_vec[::-1].astype(int))
         return index_vec, rev_index_vec
 
     def _fisher_enrichment(self, attribute: str) -> list:
@@ -295,7 +478,7 @@ class EnrichmentRunner:
 
     def _randomization_enrichment(self, attribute: str, reps: int) -> list:
         bg_array = self.annotation_df[attribute].notna().values
-        obs_array = self.annotation_df.loc[list(self.gene_set), attribute].notna().values
+        obs_array = self.annotation_df.loc[self._get_gene_list(), attribute].notna().values
         n = len(self.gene_set)
         expected_fraction = np.sum(bg_array) / bg_array.shape[0]
         observed_fraction = np.sum(obs_array) / n
@@ -310,14 +493,34 @@ class EnrichmentRunner:
         expected_fraction = go_size / bg_size
         observed_fraction = go_de_size / de_size
         log2_fold_enrichment = np.log2(observed_fraction / expected_fraction) if observed_fraction > 0 else -np.inf
-        pval = self._calc_hypergeometric_pval(bg_size=bg_size, de_size=de_size, go_size=go_size, go_de_size=go_de_size)
+        if self.attr_pvals is not None and attribute in self.attr_pvals:
+            pval = self.attr_pvals[attribute]
+        else:
+            pval = self._calc_hypergeometric_pval(bg_size=bg_size, de_size=de_size, go_size=go_size,
+                                                  go_de_size=go_de_size)
         obs, exp = int(de_size * observed_fraction), de_size * expected_fraction
 
         return [attribute, de_size, obs, exp, log2_fold_enrichment, pval]
 
     @staticmethod
-    @generic.numba.jit(nopython=True)
     def _calc_randomization_pval(n: int, log2fc: float, bg_array: np.ndarray, reps: int, obs_frac: float) -> float:
+        if bg_array.dtype == bool and 0 < n <= bg_array.shape[0]:
+            # when every background gene is either annotated or not, the number of annotated genes in a random sample
+            # (drawn without replacement) follows a hypergeometric distribution,
+            # so all repetitions can be drawn at once instead of sampling them one by one.
+            go_size = int(np.sum(bg_array))
+            rand_fracs = np.random.hypergeometric(go_size, bg_array.shape[0] - go_size, n, size=reps) / n
+            if log2fc >= 0:
+                success = np.sum(rand_fracs >= obs_frac)
+            else:
+                success = np.sum(rand_fracs <= obs_frac)
+            return (success + 1) / (reps + 1)
+        return EnrichmentRunner._calc_weighted_randomization_pval(n, log2fc, bg_array, reps, obs_frac)
+
+    @staticmethod
+    @generic.numba.jit(nopython=True)
+    def _calc_weighted_randomization_pval(n: int, log2fc: float, bg_array: np.ndarray, reps: int,
+                                          obs_frac: float) -> float:
         ind_range = np.arange(bg_array.shape[0])
         success = 0
         if log2fc >= 0:
@@ -333,10 +536,23 @@ class EnrichmentRunner:
     @staticmethod
     @lru_cache(maxsize=256, typed=False)
     def _calc_fisher_pval(bg_size: int, de_size: int, go_size: int, go_de_size: int) -> float:
-        contingency_table = [[go_de_size, go_size - go_de_size],
-                             [de_size - go_de_size, bg_size - go_size - de_size + go_de_size]]
-        _, pval = fisher_exact(contingency_table)
-        return pval
+        # two-sided Fisher's exact test, calculated directly from the hypergeometric probabilities of all tables
+        # with the same margins. equivalent to scipy.stats.fisher_exact, but without its per-call overhead.
+        if de_size in {0, bg_size} or go_size in {0, bg_size}:
+            return 1.0
+        min_x = max(0, de_size + go_size - bg_size)
+        max_x = min(de_size, go_size)
+        x = np.arange(min_x, max_x + 1)
+        log_fact = _get_log_factorials(bg_size)
+        log_pmf = (log_fact[go_size] - log_fact[x] - log_fact[go_size - x]
+                   + log_fact[bg_size - go_size] - log_fact[de_size - x]
+                   - log_fact[bg_size - go_size - de_size + x]
+                   - log_fact[bg_size] + log_fact[de_size] + log_fact[bg_size - de_size])
+        pmf = np.exp(log_pmf)
+        # sum the probabilities of all tables that are at most as likely as the observed one
+        # (with a small relative tolerance for floating-point errors)
+        pval = np.sum(pmf[pmf <= pmf[go_de_size - min_x] * (1 + 1e-7)])
+        return min(float(pval), 1.0)
 
     @staticmethod
     def _calc_hypergeometric_pval(bg_size: int, de_size: int, go_size: int, go_de_size: int) -> float:
@@ -369,25 +585,47 @@ class EnrichmentRunner:
         except ZeroDivisionError:
             return hypergeom.cdf(go_de_size, bg_size, go_size, de_size)
 
+    @staticmethod
+    def _calc_hypergeometric_pvals(bg_size: int, de_size: int, go_sizes: np.ndarray,
+                                   go_de_sizes: np.ndarray) -> np.ndarray:
+        """
+        Performs the hypergeometric test of _calc_hypergeometric_pval() for multiple attributes at once.
+
+        :param bg_size: size of the background set. Usually denoted as 'M'.
+        :type bg_size: positive int
+        :param de_size: size of the differentially-expressed set, or size of test set. usually denoted as 'N'.
+        :type de_size: positive int
+        :param go_sizes: number of features in the background set corresponding to each attribute.
+        :type go_sizes: np.ndarray of positive ints
+        :param go_de_sizes: number of features in the test set corresponding to each attribute.
+        :type go_de_sizes: np.ndarray of non-negative ints
+        :return: p-values of the hypergeometric test for each attribute.
+        :rtype: np.ndarray of floats between 0 and 1
+        """
+        depleted = np.zeros(go_sizes.shape, dtype=bool) if de_size == 0 else go_de_sizes / de_size < go_sizes / bg_size
+        return np.where(depleted, hypergeom.cdf(go_de_sizes, bg_size, go_sizes, de_size),
+                        hypergeom.sf(go_de_sizes - 1, bg_size, go_sizes, de_size))
+
     def _get_background_set_from_biotype(self):
         if self.biotypes == 'all':
             self.background_set = parsing.data_to_set(self.annotation_df.index)
         else:
-            biotype_ref_df = io.load_csv(self.biotype_ref_path)
-            validation.validate_biotype_table(biotype_ref_df)
-            biotype_ref_df.set_index('gene', inplace=True)
             self.biotypes = parsing.data_to_list(self.biotypes)
-            mask = pd.Series(np.zeros_like(biotype_ref_df['biotype'].values, dtype=bool),
-                             biotype_ref_df['biotype'].index, name='biotype')
-            for biotype in self.biotypes:
-                mask = mask | (biotype_ref_df['biotype'] == biotype)
-            self.background_set = parsing.data_to_set(biotype_ref_df[mask].index)
+            ref_path = Path(self.biotype_ref_path).resolve()
+            self.background_set = _get_biotype_background_set(ref_path, ref_path.stat().st_mtime_ns,
+                                                              tuple(self.biotypes))
 
     def _get_background_set_from_set(self):
         self.background_set = parsing.data_to_set(self.background_set)
         if self.biotypes != 'all':
             warnings.warn("both 'biotype' and 'background_genes' were specified. Therefore 'biotype' is ignored.")
 
+    def _get_gene_list(self) -> list:
+        # the list is built once per gene set object, since 'gene_set' is only ever replaced, not modified in-place
+        if self.gene_list is None or self.gene_list[0] is not self.gene_set:
+            self.gene_list = (self.gene_set, list(self.gene_set))
+        return self.gene_list[1]
+
     def update_gene_set(self):
         if self.single_set:
             updated_gene_set = self.gene_set.intersection(self.annotation_df.index)
@@ -408,7 +646,7 @@ class EnrichmentRunner:
                               f"Enrichment will be computed on the remaining {len(self.gene_set)} genes.")
 
     def fetch_annotations(self):
-        self.annotation_df = io.load_csv(self.attr_ref_path)
+        self.annotation_df = io.load_reference_table(self.attr_ref_path)
         validation.validate_attr_table(self.annotation_df)
         self.annotation_df.set_index('gene', inplace=True)
 
@@ -457,19 +695,70 @@ class EnrichmentRunner:
                 f"random_seed must be a non-negative integer. Value '{self.random_seed}' is invalid."
             np.random.seed(self.random_seed)
 
+    def _calculate_attribute_counts(self):
+        # count the annotated genes of every attribute in the background set and in the enrichment set at once,
+        # instead of slicing the annotation table separately for every attribute
+        is_annotated = self.annotation_df.notna().values
+        in_gene_set = self.annotation_df.index.isin(self.gene_set)
+        go_sizes = np.count_nonzero(is_annotated, axis=0)
+        go_de_sizes = np.count_nonzero(is_annotated[in_gene_set], axis=0)
+        self.attr_counts = {attr: (go_size, go_de_size) for attr, go_size, go_de_size in
+                            zip(self.annotation_df.columns, go_sizes, go_de_sizes)}
+
+    def _calculate_hypergeometric_pvals(self):
+        attrs = list(self.attr_counts)
+        counts = np.array([self.attr_counts[attr] for attr in attrs], dtype=int).reshape(-1, 2)
+        pvals = self._calc_hypergeometric_pvals(self.annotation_df.shape[0], len(self.gene_set), counts[:, 0],
+                                                counts[:, 1])
+        self.attr_pvals = dict(zip(attrs, pvals))
+
+    def _precalculate_enrichment(self):
+        # statistics that can be calculated for all attributes at once are calculated in advance,
+        # so that the per-attribute enrichment functions only need to look them up
+        if self.enrichment_func in (self._fisher_enrichment, self._hypergeometric_enrichment):
+            self._calculate_attribute_counts()
+            if self.enrichment_func == self._hypergeometric_enrichment:
+                self._calculate_hypergeometric_pvals()
+        elif self.enrichment_func == self._xlmhg_enrichment:
+            self._calculate_ranked_annotations()
+
+    def _calculate_ranked_annotations(self):
+        # re-order the annotation table by rank once, instead of slicing it separately for every attribute
+        ranked_df = self.annotation_df.loc[self.ranked_genes]
+        assert ranked_df.shape[0] == len(self.ranked_genes)
+        self.ranked_annotations = dict(zip(ranked_df.columns, ranked_df.notna().values.T))
+
     def _calculate_enrichment_serial(self) -> list:
+        self._precalculate_enrichment()
         result = []
-        for attribute in tqdm(self.attributes, desc="Calculating enrichment", unit='attributes'):
+        for attribute, seed in tqdm(zip(self.attributes, self._get_attribute_seeds()), total=len(self.attributes),
+                                    desc="Calculating enrichment", unit='attributes'):
             assert isinstance(attribute, str), f"Error in attribute {attribute}: attributes must be strings!"
-            result.append(self.enrichment_func(attribute, **self.pvalue_kwargs))
+            result.append(self._seeded_enrichment(attribute, seed, **self.pvalue_kwargs))
             # print(f"Finished {n_attrs + 1} attributes out of {len(self.attributes)}", end='\r')
         return result
 
     def _calculate_enrichment_parallel(self) -> list:
+        self._precalculate_enrichment()
         result = generic.ProgressParallel(n_jobs=-1, desc="Calculating enrichment", unit='attribute')(
-            joblib.delayed(self.enrichment_func)(attribute, **self.pvalue_kwargs) for attribute in self.attributes)
+            joblib.delayed(self._seeded_enrichment)(attribute, seed, **self.pvalue_kwargs) for attribute, seed in
+            zip(self.attributes, self._get_attribute_seeds()))
         return result
 
+    def _get_attribute_seeds(self) -> list:
+        # worker processes do not share the random state of the main process, so every attribute gets its own seed
+        # (derived from the user's random seed through a SeedSequence, so that the attributes' random streams are
+        # independent of each other and of those of nearby seeds). serial runs use the same seeds, so that the
+        # results do not depend on whether the attributes were processed in parallel
+        if self.random_seed is None:
+            return [None] * len(self.attributes)
+        return np.random.SeedSequence(self.random_seed).generate_state(len(self.attributes)).tolist()
+
+    def _seeded_enrichment(self, attribute: str, seed: Union[int, None], **pvalue_kwargs) -> list:
+        if seed is not None:
+            np.random.seed(seed)
+        return self.enrichment_func(attribute, **pvalue_kwargs)
+
     def format_results(self, unformatted_results_list: list):
         if self.single_set:
             columns = ['name', 'samples', self.en_score_col, 'pval']
@@ -517,115 +806,8 @@ class EnrichmentRunner:
         :return: Figure object containing the bar plot
         :rtype: matplotlib.figure.Figure instance
         """
-        plt.style.use('seaborn-white')
-        # determine number of entries/bars to plot
-        if n_bars != 'all':
-            assert isinstance(n_bars, int)
-            if n_bars < 1:
-                return
-            results = self.results.iloc[:n_bars]
-        else:
-            results = self.results
-        # pull names/scores/pvals out to avoid accidentally changing the results DataFrame in-place
-        enrichment_names = results.index.values.tolist() if name_col is None else results[name_col].values.tolist()
-        enrichment_scores = results[self.en_score_col].values.tolist()
-        enrichment_pvalue = results['padj'].values.tolist()
-
-        # choose functions and parameters according to the graph's orientation (horizontal vs vertical)
-        if self.plot_horizontal:
-            figsize = [10.5, 0.4 * (4.8 + self.results.shape[0])]
-            bar_func = plt.Axes.barh
-            line_func = plt.Axes.axvline
-            cbar_kwargs = dict(location='bottom')
-            tick_func = plt.Axes.set_yticks
-            ticklabels_func = plt.Axes.set_yticklabels
-            ticklabels_kwargs = dict(fontsize=13, rotation=0)
-            for lst in (enrichment_names, enrichment_scores, enrichment_pvalue):
-                lst.reverse()
-        else:
-            figsize = [0.5 * (4.8 + self.results.shape[0]), 4.2]
-            bar_func = plt.Axes.bar
-            line_func = plt.Axes.axhline
-            cbar_kwargs = dict(location='left')
-            tick_func = plt.Axes.set_xticks
-            ticklabels_func = plt.Axes.set_xticklabels
-            ticklabels_kwargs = dict(fontsize=13, rotation=45)
-
-        # set enrichment scores which are 'inf' or '-inf' to be the second highest/lowest enrichment score in the list
-        scores_no_inf = [i for i in enrichment_scores if i != np.inf and i != -np.inf and i < 0]
-        if len(scores_no_inf) == 0:
-            scores_no_inf.append(-1)
-        for i in range(len(enrichment_scores)):
-            if enrichment_scores[i] == -np.inf:
-                enrichment_scores[i] = min(scores_no_inf)
-        if len(enrichment_scores) > 3:
-            max_score = max(np.max(np.abs(enrichment_scores)), 2)
-        else:
-            max_score = 2
-
-        # get color values for bars
-        data_color_norm = [0.5 * (1 + i / (np.floor(max_score) + 1)) * 255 for i in enrichment_scores]
-        data_color_norm_8bit = [int(i) if i != np.inf and i != -np.inf else np.sign(i) * max(np.abs(scores_no_inf)) for
-                                i in data_color_norm]
-        my_cmap = plt.cm.get_cmap('coolwarm')
-        colors = my_cmap(data_color_norm_8bit)
-
-        # generate bar plot
-        fig, ax = plt.subplots(constrained_layout=True, figsize=figsize)
-        bar = bar_func(ax, range(len(enrichment_names)), enrichment_scores, color=colors, edgecolor='black',
-                       linewidth=1, zorder=2)
-        bar.tick_labels = enrichment_names
-        # determine bounds, and enlarge the bound by a small margin (0.2%) so nothing gets cut out of the figure
-        bounds = np.array([np.ceil(-max_score) - 1, (np.floor(max_score) + 1)]) * 1.002
-        # add black line at y=0 and grey lines at every round positive/negative integer in range
-        for ind in range(int(bounds[0]) + 1, int(bounds[1]) + 1):
-            color = 'black' if ind == 0 else 'grey'
-            linewidth = 1 if ind == 0 else 0.5
-            linestyle = '-' if ind == 0 else '-.'
-            line_func(ax, ind, color=color, linewidth=linewidth, linestyle=linestyle, zorder=0)
-        # add colorbar
-        sm = ScalarMappable(cmap=my_cmap, norm=plt.Normalize(*bounds))
-        sm.set_array(np.array([]))
-        cbar_label_kwargs = dict(label=ylabel, fontsize=16, labelpad=15)
-        cbar = fig.colorbar(sm, ticks=range(int(bounds[0]), int(bounds[1]) + 1), **cbar_kwargs)
-        cbar.set_label(**cbar_label_kwargs)
-        cbar.ax.tick_params(labelsize=14, pad=6)
-        # apply xticks
-        tick_func(ax, range(len(enrichment_names)))
-        ticklabels_func(ax, enrichment_names, **ticklabels_kwargs)
-        # title
-        ax.set_title(title, fontsize=18)
-        # add significance asterisks
-        for col, sig in zip(bar, enrichment_pvalue):
-            asterisks, fontweight = self._get_pval_asterisk(sig, self.alpha)
-            if self.plot_horizontal:
-                x = col._width
-                y = col.xy[1] + 0.5 * col._height
-                valign = 'center'
-                halign = 'left' if np.sign(col._width) == 1 else 'right'
-                rotation = 270 if np.sign(col._width) == 1 else 90
-            else:
-                x = col.xy[0] + 0.5 * col._width
-                y = col._height
-                valign = 'bottom' if np.sign(col._height) == 1 else 'top'
-                halign = 'center'
-                rotation = 0
-
-            ax.text(x=x, y=y, s=asterisks, fontname='DejaVu Sans', fontweight=fontweight, rotation=rotation,
-                    fontsize=9, horizontalalignment=halign, verticalalignment=valign, zorder=1)
-        # despine
-        _ = [ax.spines[side].set_visible(False) for side in ['top', 'right']]
-        # center bars
-        if center_bars:
-            if self.plot_horizontal:
-                ax.set_xbound(bounds)
-                plt.tick_params(axis='x', which='both', bottom=False, top=False, labelbottom=False)
-            else:
-                ax.set_ybound(bounds)
-                plt.tick_params(axis='y', which='both', left=False, right=False, labelleft=False)
-
-        plt.show()
-        return fig
+        return enrichment_bar_plot(self.results, self.en_score_col, self.alpha, self.plot_horizontal, n_bars,
+                                   name_col, center_bars, ylabel, title)
 
     @staticmethod
     def _get_pval_asterisk(pval: float, alpha: float = 0.05):
@@ -683,20 +865,20 @@ class NonCategoricalEnrichmentRunner(EnrichmentRunner):
 
     def _sign_test_enrichment(self, attribute: str) -> list:
         exp = self.annotation_df[attribute].median(skipna=True)
-        obs = self.annotation_df.loc[list(self.gene_set), attribute].median(skipna=False)
+        obs = self.annotation_df.loc[self._get_gene_list(), attribute].median(skipna=False)
         if np.isnan(obs):
             pval = np.nan
         else:
-            _, pval = sign_test(self.annotation_df.loc[list(self.gene_set), attribute].values, exp)
+            _, pval = sign_test(self.annotation_df.loc[self._get_gene_list(), attribute].values, exp)
         return [attribute, len(self.gene_set), obs, exp, pval]
 
     def _one_sample_t_test_enrichment(self, attribute: str) -> list:
         exp = self.annotation_df[attribute].mean(skipna=True)
-        obs = self.annotation_df.loc[list(self.gene_set), attribute].mean(skipna=False)
+        obs = self.annotation_df.loc[self._get_gene_list(), attribute].mean(skipna=False)
         if np.isnan(obs):
             pval = np.nan
         else:
-            _, pval = ttest_1samp(self.annotation_df.loc[list(self.gene_set), attribute], popmean=exp)
+            _, pval = ttest_1samp(self.annotation_df.loc[self._get_gene_list(), attribute], popmean=exp)
         return [attribute, len(self.gene_set), obs, exp, pval]
 
     def format_results(self, unformatted_results_list: list):
@@ -719,7 +901,7 @@ class NonCategoricalEnrichmentRunner(EnrichmentRunner):
     def enrichment_histogram(self, attribute):
         # generate observed and expected Series, either linear or in log10 scale
         exp = self.annotation_df[attribute]
-        obs = exp.loc[list(self.gene_set)]
+        obs = exp.loc[self._get_gene_list()]
         if self.plot_log_scale:
             xlabel = r"$\log_{10}$" + f"({attribute})"
             exp = np.log10(exp)
@@ -840,10 +1022,19 @@ class KEGGEnrichmentRunner(EnrichmentRunner):
         if query_key in self.KEGG_DF_QUERIES:
             self.annotation_df, self.pathway_names_dict = self.KEGG_DF_QUERIES[query_key]
             return
+        # when the gene ID type is inferred automatically, the annotations also depend on the enrichment set,
+        # so they are only cached on disk when the gene ID type is explicit
+        cache_fname = None if self.gene_id_type.lower() == 'auto' else \
+            _get_annotation_cache_filename('kegg_annotations', query_key)
+        cached = None if cache_fname is None else io.load_cached_object(cache_fname)
+        if cached is not None:
+            self.annotation_df, self.pathway_names_dict = cached
         else:
             self.annotation_df, self.pathway_names_dict = self._generate_annotation_df()
-            # save query results to KEGG_DF_QUERIES
-            self.KEGG_DF_QUERIES[query_key] = self.annotation_df, self.pathway_names_dict
+            if cache_fname is not None:
+                io.cache_object((self.annotation_df, self.pathway_names_dict), cache_fname)
+        # save query results to KEGG_DF_QUERIES
+        self.KEGG_DF_QUERIES[query_key] = self.annotation_df, self.pathway_names_dict
 
     def _generate_annotation_df(self) -> Tuple[pd.DataFrame, Dict[str, str]]:
         # fetch and process KEGG annotations
@@ -982,10 +1173,19 @@ class GOEnrichmentRunner(EnrichmentRunner):
         if query_key in self.GOA_DF_QUERIES:
             self.annotation_df = self.GOA_DF_QUERIES[query_key]
             return
+        # when the gene ID type is inferred automatically, the annotations also depend on the enrichment set,
+        # so they are only cached on disk when the gene ID type is explicit
+        cache_fname = None if self.gene_id_type.lower() == 'auto' else \
+            _get_annotation_cache_filename('go_annotations', query_key)
+        cached = None if cache_fname is None else io.load_cached_object(cache_fname)
+        if cached is not None:
+            self.annotation_df = cached
         else:
             self.annotation_df = self._generate_annotation_df()
-            # save query results to GOA_DF_QUERIES
-            self.GOA_DF_QUERIES[query_key] = self.annotation_df
+            if cache_fname is not None:
+                io.cache_object(self.annotation_df, cache_fname)
+        # save query results to GOA_DF_QUERIES
+        self.GOA_DF_QUERIES[query_key] = self.annotation_df
 
     def _generate_annotation_df(self) -> pd.DataFrame:
         # fetch and process GO annotations
@@ -1447,8 +1647,8 @@ class GOEnrichmentRunner(EnrichmentRunner):
         bg_size = self.annotation_df.shape[0]
         n = len(self.gene_set)
         expected_fraction = self.annotation_df[go_id].sum() / bg_size
-        observed_fraction = self.annotation_df.loc[list(self.gene_set), go_id].sum() / n
-        mod_observed_fraction = bg_df.loc[list(self.gene_set)].sum() / n
+        observed_fraction = self.annotation_df.loc[self._get_gene_list(), go_id].sum() / n
+        mod_observed_fraction = bg_df.loc[self._get_gene_list()].sum() / n
         log2_fold_enrichment = np.log2(observed_fraction / expected_fraction) if observed_fraction > 0 else -np.inf
         pval = self._calc_randomization_pval(n, log2_fold_enrichment, bg_df.values, reps, mod_observed_fraction)
         return [go_name, n, int(n * observed_fraction), n * expected_fraction, log2_fold_enrichment, pval]
@@ -1469,7 +1669,7 @@ class GOEnrichmentRunner(EnrichmentRunner):
         ranked_srs = self.mod_annotation_dfs[mod_df_ind].loc[self.ranked_genes, attribute]
         assert ranked_srs.shape[0] == len(self.ranked_genes)
         index_vec = np.uint16(np.nonzero(ranked_srs.values)[0])
-        rev_index_vec = np.uint16([n - 1 - index_vec[i - 1] for i in range(len(index_vec), 0, -1)])
+        rev_index_vec = np.uint16(n - 1 - index_vec[::-1].astype(int))
         return index_vec, rev_index_vec
 
     def _hypergeometric_enrichment(self, go_id: str, mod_df_ind: int = None) -> list:
@@ -1477,7 +1677,7 @@ class GOEnrichmentRunner(EnrichmentRunner):
 
         go_name = self.dag_tree[go_id].name
         expected_fraction = self.annotation_df[go_id].sum() / bg_size
-        observed_fraction = self.annotation_df.loc[list(self.gene_set), go_id].sum() / de_size
+        observed_fraction = self.annotation_df.loc[self._get_gene_list(), go_id].sum() / de_size
         log2_fold_enrichment = np.log2(observed_fraction / expected_fraction) if observed_fraction > 0 else -np.inf
         pval = self._calc_hypergeometric_pval(bg_size=bg_size, de_size=de_size, go_size=go_size, go_de_size=go_de_size)
         obs, exp = int(de_size * observed_fraction), de_size * expected_fraction
@@ -1487,7 +1687,7 @@ class GOEnrichmentRunner(EnrichmentRunner):
         bg_size, de_size, go_size, go_de_size = self._get_hypergeometric_parameters(go_id, mod_df_ind)
 
         expected_fraction = self.annotation_df[go_id].sum() / bg_size
-        observed_fraction = self.annotation_df.loc[list(self.gene_set), go_id].sum() / de_size
+        observed_fraction = self.annotation_df.loc[self._get_gene_list(), go_id].sum() / de_size
         log2_fold_enrichment = np.log2(observed_fraction / expected_fraction) if observed_fraction > 0 else -np.inf
         pval = self._calc_fisher_pval(bg_size=bg_size, de_size=de_size, go_size=go_size, go_de_size=go_de_size)
         obs, exp = int(de_size * observed_fraction), de_size * expected_fraction
@@ -1497,5 +1697,5 @@ class GOEnrichmentRunner(EnrichmentRunner):
         bg_size = self.mod_annotation_dfs[mod_df_ind].shape[0]
         de_size = len(self.gene_set)
         go_size = int(np.ceil(self.mod_annotation_dfs[mod_df_ind][go_id].sum()))
-        go_de_size = int(np.ceil(self.mod_annotation_dfs[mod_df_ind].loc[list(self.gene_set), go_id].sum()))
+        go_de_size = int(np.ceil(self.mod_annotation_dfs[mod_df_ind].loc[self._get_gene_list(), go_id].sum()))
         return bg_size, de_size, go_size, go_de_size
@@ -157,12 +157,24 @@ def get_method_signature(method: Union[str, Callable], obj: object = None):
             func = getattr(obj, method)
         else:
             func = method
-        signature = inspect.signature(func)
-        return signature.parameters
+        # bound methods are cached by their underlying function, so that the cache does not keep their instances alive
+        if inspect.ismethod(func):
+            return _get_signature_parameters(func.__func__, True)
+        return _get_signature_parameters(func, False)
     except AttributeError:
         return {}
 
 
+@lru_cache(maxsize=1024)
+def _get_signature_parameters(func: Callable, is_bound: bool):
+    # the returned parameters are a read-only mapping, and can therefore be safely shared between callers
+    signature = inspect.signature(func)
+    if is_bound:
+        # like inspect.signature() does for bound methods, drop the parameter the instance is bound to
+        signature = signature.replace(parameters=tuple(signature.parameters.values())[1:])
+    return signature.parameters
+
+
 def despine(ax):
     for side in ['top', 'right']:
         ax.spines[side].set_visible(False)
@@ -173,9 +185,14 @@ def mix_colors(*colors: Tuple[float, float, float]):
     if n_colors == 1:
         return colors[0]
 
-    colors = np.array(colors)
-    multiplier = (1 / n_colors) + (1.6 / (2 ** n_colors)) / n_colors
+    return mix_colors_by_membership(np.ones((1, n_colors)), colors)[0]
 
-    mix_color = multiplier * np.sum(colors, axis=0)
-    mix_color = np.min([mix_color, [1.0, 1.0, 1.0]], 0)
-    return mix_color
+
+def mix_colors_by_membership(membership: np.ndarray, colors) -> np.ndarray:
+    # mixes the colors marked in every row of a binary membership matrix (shape: n_mixes x n_colors) at once,
+    # using the same formula as mix_colors(). rows that include a single color keep that color unchanged.
+    membership = np.asarray(membership, dtype=float).reshape(-1, len(colors))
+    n_colors = membership.sum(axis=1, keepdims=True)
+    color_sums = membership @ np.asarray(colors, dtype=float).reshape(len(colors), -1)
+    multiplier = (1 / n_colors) + (1.6 / (2 ** n_colors)) / n_colors
+    return np.where(n_colors == 1, color_sums, np.minimum(multiplier * color_sums, 1.0))
@@ -75,6 +75,23 @@ def cache_file(content: str, filename: str):
         f.write(content)
 
 
+def load_cached_object(filename: str):
+    directory = get_todays_cache_dir()
+    file_path = directory.joinpath(filename)
+    if file_path.exists():
+        return pd.read_pickle(file_path)
+    else:
+        return None
+
+
+def cache_object(item, filename: str):
+    directory = get_todays_cache_dir()
+    if not directory.exists():
+        directory.mkdir(parents=True)
+    file_path = directory.joinpath(filename)
+    pd.to_pickle(item, file_path)
+
+
 def clear_gui_cache():
     directory = get_gui_cache_dir()
     if not directory.exists():
@@ -255,6 +272,27 @@ def load_csv(filename: Union[str, Path], index_col: int = None, drop_columns: Un
     return df
 
 
+def load_reference_table(filename: Union[str, Path]) -> pd.DataFrame:
+    """
+    loads a reference table (such as an Attribute or Biotype Reference Table) into a pandas DataFrame. \
+    Tables that were already loaded are reused, as long as the file was not modified since it was last loaded.
+
+    :type filename: str or pathlib.Path
+    :param filename: name of the csv file to be loaded
+    :return: a copy of the loaded pandas DataFrame, which can be safely modified by the caller
+    """
+    assert isinstance(filename,
+                      (str, Path)), f"Filename must be of type str or pathlib.Path, is instead {type(filename)}."
+    path = Path(filename).resolve()
+    return _load_reference_table_version(path, path.stat().st_mtime_ns).copy(deep=True)
+
+
+@functools.lru_cache(maxsize=8)
+def _load_reference_table_version(path: Path, mtime: int) -> pd.DataFrame:
+    # 'mtime' is only part of the cache key, so that modified files are loaded again
+    return load_csv(path)
+
+
 def save_csv(df: pd.DataFrame, filename: Union[str, Path], suffix: str = None, index: bool = True):
     """
     save a pandas DataFrame to csv.
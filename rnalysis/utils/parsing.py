@@ -1,7 +1,7 @@
-import itertools
 import re
 from tqdm.auto import tqdm
 import warnings
+from functools import lru_cache
 from itertools import islice
 from typing import Any, Dict, Union, List, Tuple
 
@@ -221,6 +221,66 @@ def parse_docstring(docstring: str) -> Tuple[str, Dict[str, str]]:
     return desc, params
 
 
+def count_set_memberships(sets: List[set]) -> np.ndarray:
+    """
+    Count the number of features in every combination of the given sets.
+
+    :param sets: the sets to count.
+    :type sets: list of sets
+    :return: an array of length 2 ** len(sets), where element i is the number of features that appear in exactly \
+    the sets whose bits are set in i (bit j representing sets[j]). Element 0 is always 0.
+    """
+    # encode the membership of every feature as a bit pattern (bit j is set if the feature appears in set j),
+    # so that the size of every group can be counted in a single pass over all features
+    all_features = pd.Index(list(set().union(*sets)))
+    membership = np.zeros(len(all_features), dtype='int64')
+    for j, this_set in enumerate(sets):
+        membership[all_features.isin(this_set)] |= 1 << j
+    return np.bincount(membership, minlength=2 ** len(sets))
+
+
+def venn_region_sizes(sets: List[set]) -> Tuple[int, ...]:
+    """
+    Calculate the sizes of the regions of a Venn diagram of 2-3 sets, \
+    in the order expected by matplotlib_venn (10, 01, 11) or (100, 010, 110, 001, 101, 011, 111).
+
+    :param sets: the 2-3 sets to count.
+    :type sets: list of sets
+    :return: a tuple with the size of every region of the Venn diagram.
+    """
+    # the region sizes are derived by inclusion-exclusion from the sizes of the pairwise and triple intersections,
+    # without building a set for every region
+    if len(sets) == 2:
+        a, b = sets
+        ab = len(a & b)
+        return len(a) - ab, len(b) - ab, ab
+    a, b, c = sets
+    a_and_b = a & b
+    ab, ac, bc = len(a_and_b), len(a & c), len(b & c)
+    abc = len(a_and_b & c)
+    return (len(a) - ab - ac + abc, len(b) - ab - bc + abc, ab - abc, len(c) - ac - bc + abc, ac - abc, bc - abc,
+            abc)
+
+
+@lru_cache(maxsize=32)
+def generate_patch_ids(n_sets: int, sort_by_size: bool = False) -> Tuple[Tuple[int, ...], ...]:
+    """
+    Generate the IDs of all non-empty subsets of a Venn diagram or UpSet plot, \
+    where every ID is a tuple of 0s and 1s marking which of the sets the subset includes.
+
+    :param n_sets: the number of sets.
+    :type n_sets: int
+    :param sort_by_size: if False, the IDs are returned in the order of itertools.product(). \
+    If True, they are sorted by the number of sets they include, and then by their elements from last to first.
+    :type sort_by_size: bool (default=False)
+    :return: a tuple of subset IDs.
+    """
+    bits = (np.arange(1, 2 ** n_sets)[:, None] >> np.arange(n_sets - 1, -1, -1)) & 1
+    if sort_by_size:
+        bits = bits[np.lexsort([bits[:, i] for i in range(n_sets)] + [bits.sum(axis=1)])]
+    return tuple(tuple(row) for row in bits.tolist())
+
+
 def generate_upset_series(objs: dict):
     """
     Receives a dictionary of sets from enrichment._fetch_sets(), \
@@ -233,14 +293,11 @@ def generate_upset_series(objs: dict):
     """
     names = list(objs.keys())
     multi_ind = pd.MultiIndex.from_product([[True, False] for _ in range(len(names))], names=names)[:-1]
-    srs = pd.Series(index=multi_ind, dtype='uint32')
-    for ind in multi_ind:
-        intersection_sets = list(itertools.compress(names, ind))
-        difference_sets = list(itertools.compress(names, (not i for i in ind)))
-        group = set.intersection(*[objs[s] for s in intersection_sets]).difference(*[objs[s] for s in difference_sets])
-        group_size = len(group)
-        srs.loc[ind] = group_size
-    return srs
+    group_sizes = count_set_memberships(list(objs.values()))
+    bit_values = np.left_shift(1, np.arange(len(names), dtype='int64'))
+    group_patterns = np.array(list(multi_ind), dtype=bool).reshape(-1, len(names)) @ bit_values
+    # group sizes are returned as floats, like the Series that was previously filled in one group at a time
+    return pd.Series(group_sizes[group_patterns], index=multi_ind, dtype='float64')
 
 
 def parse_version(version: str):
@@ -4,7 +4,7 @@ import requests
 import statsmodels.stats.multitest as multitest
 import sys
 from rnalysis.enrichment import *
-from rnalysis.enrichment import _fetch_sets
+from rnalysis.enrichment import _fetch_sets, _draw_venn_region_outlines
 from rnalysis.utils.enrichment_runner import does_python_version_support_single_set
 from tests import __attr_ref__, __biotype_ref__
 
@@ -82,7 +82,7 @@ def test_featureset_change_set_name():
     en.change_set_name('different name')
     assert en.set_name == 'different name'
 
-    with pytest.raises(AssertionError):
+    with pytest.raises(TypeError):
         en.change_set_name(5)
 
 
@@ -123,6 +123,26 @@ def test_featureset_intersection():
     assert np.all(intersection_res.gene_set == truth)
 
 
+def test_featureset_intersection_multiple_sets():
+    first = {'WBGene00016520', 'WBGene00017225', 'WBGene00044200', 'WBGene00206390'}
+    second = frozenset({'WBGene00044200', 'WBGene00206390', 'WBGene00022523'})
+    third = FeatureSet({'WBGene00044200', 'WBGene00000001'})
+    truth = {'WBGene00044200'}
+    first_set = FeatureSet(first)
+    assert first_set.intersection(second, third).gene_set == truth
+    assert first_set.intersection(third, second).gene_set == truth
+    assert third.intersection(first_set, second).gene_set == truth
+
+
+@pytest.mark.parametrize("first,others", [
+    (set(), ({'a', 'b'},)),
+    ({'a', 'b'}, (set(),)),
+    ({'a', 'b'}, ({'a', 'c'}, FeatureSet(set()))),
+])
+def test_featureset_intersection_empty(first, others):
+    assert FeatureSet(first).intersection(*others).gene_set == set()
+
+
 def test_featureset_difference():
     other = {'WBGene00017419', 'WBGene00016520', 'WBGene00017225', 'WBGene00044200', 'WBGene00206390',
              'WBGene00022523', 'WBGene00000001', 'WBGene00000002'}
@@ -133,6 +153,21 @@ def test_featureset_difference():
     assert np.all(diff_res.gene_set == truth)
 
 
+def test_featureset_difference_with_itself():
+    first = FeatureSet({'WBGene00016520', 'WBGene00017225', 'WBGene00044200'})
+    assert first.difference(first).gene_set == set()
+    assert first.difference({'WBGene00000001'}, first).gene_set == set()
+    assert first.symmetric_difference(first).gene_set == set()
+
+
+def test_featureset_difference_multiple_sets():
+    first = FeatureSet({'WBGene00016520', 'WBGene00017225', 'WBGene00044200'})
+    assert first.difference({'WBGene00016520'}, frozenset({'WBGene00017225'})).gene_set == {'WBGene00044200'}
+    assert first.difference(first.gene_set.copy(), {'WBGene00000001'}).gene_set == set()
+    assert first.difference().gene_set == first.gene_set
+    assert first.difference().gene_set is not first.gene_set
+
+
 def test_featureset_symmetric_difference():
     first = {'WBGene00016520', 'WBGene00017225', 'WBGene00044200', 'WBGene00206390'}
     second = {'WBGene00044200', 'WBGene00206390',
@@ -179,6 +214,21 @@ def test_biotypes():
     assert np.all(df == truth)
 
 
+def test_biotypes_exclude_missing():
+    truth = io.load_csv('tests/test_files/biotypes_truth.csv', 0)
+    truth = truth.drop('_missing_from_biotype_reference')
+    genes = {'WBGene00048865', 'WBGene00000106', 'WBGene00000137', 'WBGene00199484', 'WBGene00268190', 'WBGene00048864',
+             'WBGene00268189', 'WBGene00268195', 'WBGene00255734', 'WBGene00199485', 'WBGene00048863', 'WBGene00000019',
+             'WBGene00268191', 'WBGene00000041', 'WBGene00199486', 'WBGene00255735', 'WBGene00000105',
+             'index_that_is_not_in_biotype_ref_table'}
+
+    en = FeatureSet(genes)
+    df = en.biotypes(ref=__biotype_ref__, include_missing=False)
+    df.sort_index(inplace=True)
+    truth.sort_index(inplace=True)
+    assert np.all(df == truth)
+
+
 def tests_enrichment_randomization_api():
     genes = {'WBGene00048865', 'WBGene00000864', 'WBGene00000105', 'WBGene00001996', 'WBGene00011910', 'WBGene00268195'}
     attrs = ['attribute1', 'attribute2']
@@ -340,6 +390,38 @@ def test_save_txt():
             pass
 
 
+def test_save_txt_path():
+    try:
+        geneset = {'gene1', 'gene2', 'gene3', 'gene5'}
+        en = FeatureSet(geneset, 'my gene set')
+        en.save_txt(Path('tests/test_files/tmp_enrichment_txt'))
+
+        with open('tests/test_files/tmp_enrichment_txt.txt') as f:
+            loaded_geneset = {gene.replace('\n', '') for gene in f}
+        assert loaded_geneset == geneset
+    finally:
+        try:
+            os.remove('tests/test_files/tmp_enrichment_txt.txt')
+        except FileNotFoundError:
+            pass
+
+
+def test_save_txt_dotted_name():
+    try:
+        geneset = {'gene1', 'gene2', 'gene3', 'gene5'}
+        en = FeatureSet(geneset, 'my gene set')
+        en.save_txt('tests/test_files/tmp_enrichment_txt.v2')
+
+        with open('tests/test_files/tmp_enrichment_txt.v2.txt') as f:
+            loaded_geneset = {gene.replace('\n', '') for gene in f}
+        assert loaded_geneset == geneset
+    finally:
+        try:
+            os.remove('tests/test_files/tmp_enrichment_txt.v2.txt')
+        except FileNotFoundError:
+            pass
+
+
 def test_featureset_from_string(monkeypatch):
     truth = {'gene1', 'gene2', 'gene 5'}
     monkeypatch.setattr('builtins.input', lambda x: 'gene1\ngene2\ngene 5\n')
@@ -373,6 +455,27 @@ def test_rankedset_copy():
     assert s is not s2
     assert s.gene_set is not s2.gene_set
     assert s.ranked_genes is not s2.ranked_genes
+    assert not s2.ranked_genes.flags.writeable
+
+
+def test_rankedset_ranked_genes_read_only():
+    arr = np.array(['a', 'b', 'd', 'c'])
+    s = RankedSet(arr, 'name')
+    assert not s.ranked_genes.flags.writeable
+    assert arr.flags.writeable
+    with pytest.raises(ValueError):
+        s.ranked_genes[0] = 'e'
+
+
+def test_rankedset_independent_of_input_array():
+    arr = np.array(['a', 'b', 'd', 'c'])
+    s = RankedSet(arr, 'name')
+    s2 = s.__copy__()
+    arr[0] = 'e'
+    arr[1], arr[2] = 'd', 'b'
+    for ranked_set in (s, s2):
+        assert list(ranked_set.ranked_genes) == ['a', 'b', 'd', 'c']
+        assert ranked_set.gene_set == {'a', 'b', 'c', 'd'}
 
 
 @pytest.mark.parametrize("s1,s2,expected", [
@@ -584,6 +687,35 @@ def test_venn_diagram_api():
     plt.close('all')
 
 
+def test_venn_diagram_outline():
+    objs = {'obj': {'0', '1', '2'}, 'obj2': {'1', '3'}, 'obj3': {'5', '6', '7', '0'}}
+    plot_obj, circle_obj = venn_diagram(objs, linecolor='grey', linestyle='dashed', linewidth=1)
+    assert len(circle_obj) == 3
+    for circle, radius in zip(circle_obj, plot_obj.radii):
+        assert circle.radius == radius
+        assert circle.get_facecolor()[3] == 0
+        assert circle.get_linestyle() == 'dashed'
+        assert circle.get_linewidth() == 1
+    plt.close('all')
+
+
+def test_draw_venn_region_outlines():
+    plot_obj, _ = venn_diagram({'obj': {'0', '1', '2'}, 'obj2': {'1', '3'}, 'obj3': {'5', '6', '7', '0'}},
+                               add_outline=False)
+    ax = plt.gca()
+    n_patches = len(ax.patches)
+    regions = [patch for patch in plot_obj.patches if patch is not None]
+    outlines = _draw_venn_region_outlines(ax, plot_obj, 'grey', 'dashed', 1)
+    assert len(outlines) == len(regions)
+    assert len(ax.patches) == n_patches + len(regions)
+    for region, outline in zip(regions, outlines):
+        assert np.allclose(region.get_path().transformed(region.get_patch_transform()).vertices,
+                           outline.get_path().vertices)
+        assert not outline.get_fill()
+        assert outline.get_linestyle() == 'dashed'
+    plt.close('all')
+
+
 def test_venn_diagram_invalid_number_of_sets():
     with pytest.raises(ValueError):
         venn_diagram({'obj': {'0', '1', '2'}, 'obj2': {'1', '3'}, 'obj3': {'5', '6', '7', '0'}, 'obj4': {'3', '4'}})
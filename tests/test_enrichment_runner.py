@@ -6,6 +6,7 @@ import matplotlib
 import matplotlib.pyplot as plt
 import numpy as np
 import pytest
+from scipy.stats import fisher_exact
 
 from rnalysis import filtering
 from rnalysis.utils import enrichment_runner, validation
@@ -47,6 +48,34 @@ def test_calc_randomization_pval():
     assert np.isclose(avg_pval, hypergeom_pval, atol=0.02)
 
 
+def test_calc_randomization_pval_weighted():
+    np.random.seed(42)
+    hypergeom_pval = 0.2426153598589023
+    avg_pval = 0
+    for i in range(5):
+        bg_array = (np.random.random(10000) < 0.1).astype('float64')
+        avg_pval += EnrichmentRunner._calc_randomization_pval(500, 1, bg_array, 10000, 0.11)
+    avg_pval /= 5
+    assert np.isclose(avg_pval, hypergeom_pval, atol=0.02)
+
+
+@pytest.mark.parametrize('bg_size,de_size,go_size,go_de_size',
+                         [(38, 6, 11, 3), (40, 10, 15, 0), (20000, 300, 150, 12), (5000, 2500, 2500, 1250),
+                          (12, 6, 6, 3), (100, 100, 5, 5), (10, 0, 3, 0), (30, 12, 30, 12)])
+def test_calc_fisher_pval(bg_size, de_size, go_size, go_de_size):
+    _, truth = fisher_exact([[go_de_size, go_size - go_de_size],
+                             [de_size - go_de_size, bg_size - go_size - de_size + go_de_size]])
+    assert np.isclose(EnrichmentRunner._calc_fisher_pval(bg_size, de_size, go_size, go_de_size), truth,
+                      rtol=1e-6, atol=0)
+
+
+def test_get_log_factorials():
+    log_fact = enrichment_runner._get_log_factorials(25)
+    assert np.allclose(log_fact, np.concatenate([[0], np.cumsum(np.log(np.arange(1, 26)))]))
+    assert enrichment_runner._get_log_factorials(25) is log_fact
+    assert not log_fact.flags.writeable
+
+
 def test_calc_hypergeometric_pvalues():
     [M, n, N, X] = [13588, 59, 611, 19]
     truth = 4.989682834519698 * 10 ** -12
@@ -64,6 +93,16 @@ def test_calc_hypergeometric_pvalues():
     assert np.isclose(truth, pval, atol=0, rtol=0.00001)
 
 
+def test_calc_hypergeometric_pvals():
+    bg_size, de_size = 20000, 430
+    go_sizes = np.array([700, 300, 700, 0])
+    go_de_sizes = np.array([6, 3, 30, 0])
+    truth = [EnrichmentRunner._calc_hypergeometric_pval(bg_size, de_size, go_size, go_de_size) for
+             go_size, go_de_size in zip(go_sizes, go_de_sizes)]
+    pvals = EnrichmentRunner._calc_hypergeometric_pvals(bg_size, de_size, go_sizes, go_de_sizes)
+    assert np.allclose(truth, pvals, atol=0, rtol=0.00001)
+
+
 def test_enrichment_get_attrs_int_index_attributes():
     genes = {'WBGene00000041', 'WBGene00002074', 'WBGene00000105', 'WBGene00000106', 'WBGene00199484',
              'WBGene00001436', 'WBGene00000137', 'WBGene00001996', 'WBGene00014208', 'WBGene00001133'}
@@ -347,12 +386,29 @@ def test_enrichment_runner_get_enrichment_func_invalid_value(test_input, err):
                           ('attribute4', (38, 6, 13, 4))])
 def test_enrichment_runner_get_hypergeometric_parameters(attr, results):
     runner = EnrichmentRunner.__new__(EnrichmentRunner)
+    runner.attr_counts = None
+    runner.gene_list = None
     runner.annotation_df = pd.read_csv('tests/test_files/attr_ref_table_for_tests.csv', index_col=0)
     runner.gene_set = {'WBGene00000019', 'WBGene00000041', 'WBGene00000106', 'WBGene00001133', 'WBGene00003915',
                        'WBGene00268195'}
     assert runner._get_hypergeometric_parameters(attr) == results
 
 
+@pytest.mark.parametrize('attr,results',
+                         [('attribute1', (38, 6, 11, 3)),
+                          ('attribute3', (38, 6, 14, 4)),
+                          ('attribute4', (38, 6, 13, 4))])
+def test_enrichment_runner_get_hypergeometric_parameters_precalculated(attr, results):
+    runner = EnrichmentRunner.__new__(EnrichmentRunner)
+    runner.gene_list = None
+    runner.annotation_df = pd.read_csv('tests/test_files/attr_ref_table_for_tests.csv', index_col=0)
+    runner.gene_set = {'WBGene00000019', 'WBGene00000041', 'WBGene00000106', 'WBGene00001133', 'WBGene00003915',
+                       'WBGene00268195'}
+    runner._calculate_attribute_counts()
+    assert attr in runner.attr_counts
+    assert runner._get_hypergeometric_parameters(attr) == results
+
+
 @pytest.mark.parametrize('params,truth',
                          [((38, 11, 6, 5), ['attribute', 11, 5, (6 / 38) * 11, np.log2(5 / ((6 / 38) * 11)), 0.05]),
                           ((40, 10, 15, 0), ['attribute', 10, 0, (15 / 40) * 10, -np.inf, 0.05])])
@@ -365,6 +421,7 @@ def test_enrichment_runner_hypergeometric_enrichment(monkeypatch, params, truth)
 
     monkeypatch.setattr(EnrichmentRunner, '_calc_hypergeometric_pval', alt_calc_pval)
     runner = EnrichmentRunner.__new__(EnrichmentRunner)
+    runner.attr_pvals = None
     assert runner._hypergeometric_enrichment('attribute') == truth
 
 
@@ -429,6 +486,18 @@ def test_enrichment_runner_update_gene_set():
     assert runner.gene_set == updated_gene_set_truth
 
 
+def test_enrichment_runner_get_gene_list():
+    runner = EnrichmentRunner.__new__(EnrichmentRunner)
+    runner.gene_list = None
+    runner.gene_set = {'WBGene00000019', 'WBGene00000041'}
+    gene_list = runner._get_gene_list()
+    assert sorted(gene_list) == sorted(runner.gene_set)
+    assert runner._get_gene_list() is gene_list
+
+    runner.gene_set = {'WBGene00000106'}
+    assert runner._get_gene_list() == ['WBGene00000106']
+
+
 def test_enrichment_runner_update_gene_set_single_list(monkeypatch):
     monkeypatch.setattr(EnrichmentRunner, '_update_ranked_genes', lambda x: None)
     runner = EnrichmentRunner.__new__(EnrichmentRunner)
@@ -554,6 +623,7 @@ def test_enrichment_runner_xlmhg_enrichment(monkeypatch, attr, index_vector, pva
                           ('attribute4', np.array([0, 2], dtype='uint16'), np.array([1, 3], dtype='uint16'))])
 def test_enrichment_runner_generate_xlmhg_index_vectors(attribute, truth, truth_rev):
     runner = EnrichmentRunner.__new__(EnrichmentRunner)
+    runner.ranked_annotations = None
     runner.ranked_genes = np.array(['WBGene00000106', 'WBGene00000019', 'WBGene00000865', 'WBGene00001131'],
                                    dtype='str')
     runner.annotation_df = pd.read_csv('tests/test_files/attr_ref_table_for_tests.csv', index_col=0)
@@ -562,6 +632,21 @@ def test_enrichment_runner_generate_xlmhg_index_vectors(attribute, truth, truth_
     assert np.all(rev_vec == truth_rev)
 
 
+@pytest.mark.parametrize('attribute,truth, truth_rev',
+                         [('attribute1', np.array([0, 1], dtype='uint16'), np.array([2, 3], dtype='uint16')),
+                          ('attribute4', np.array([0, 2], dtype='uint16'), np.array([1, 3], dtype='uint16'))])
+def test_enrichment_runner_generate_xlmhg_index_vectors_precalculated(attribute, truth, truth_rev):
+    runner = EnrichmentRunner.__new__(EnrichmentRunner)
+    runner.ranked_genes = np.array(['WBGene00000106', 'WBGene00000019', 'WBGene00000865', 'WBGene00001131'],
+                                   dtype='str')
+    runner.annotation_df = pd.read_csv('tests/test_files/attr_ref_table_for_tests.csv', index_col=0)
+    runner._calculate_ranked_annotations()
+    runner.annotation_df = None
+    vec, rev_vec = runner._generate_xlmhg_index_vectors(attribute)
+    assert np.all(vec == truth)
+    assert np.all(rev_vec == truth_rev)
+
+
 def test_enrichment_runner_fetch_annotations(monkeypatch):
     monkeypatch.setattr(validation, 'validate_attr_table', lambda x: None)
     truth = pd.read_csv('tests/test_files/attr_ref_table_for_tests.csv', index_col=0)
@@ -674,6 +759,7 @@ def _test_enrichment_runner_calculate_enrichment_get_constants():
     runner = EnrichmentRunner.__new__(EnrichmentRunner)
     runner.attributes = ['attribute1', 'attribute2', 'attribute4']
     runner.pvalue_kwargs = {'arg1': 'val1', 'arg2': 'val2'}
+    runner.random_seed = None
 
     def enrichment_func(attr, **kwargs):
         return [attr, kwargs]
@@ -688,11 +774,57 @@ def test_enrichment_runner_calculate_enrichment_parallel():
     assert truth == runner._calculate_enrichment_parallel()
 
 
+def test_enrichment_runner_calculate_enrichment_parallel_random_seed():
+    runner = EnrichmentRunner.__new__(EnrichmentRunner)
+    runner.attributes = ['attribute1', 'attribute2', 'attribute4']
+    runner.pvalue_kwargs = {}
+    runner.random_seed = 42
+
+    def enrichment_func(attr):
+        return [attr, np.random.random()]
+
+    runner.enrichment_func = enrichment_func
+    res = runner._calculate_enrichment_parallel()
+    assert res == runner._calculate_enrichment_parallel()
+    seeds = np.random.SeedSequence(42).generate_state(len(runner.attributes))
+    for seed, (attr, val) in zip(seeds, res):
+        np.random.seed(seed)
+        assert val == np.random.random()
+
+
+def test_enrichment_runner_get_attribute_seeds():
+    runner = EnrichmentRunner.__new__(EnrichmentRunner)
+    runner.attributes = ['attribute1', 'attribute2', 'attribute4']
+    runner.random_seed = None
+    assert runner._get_attribute_seeds() == [None, None, None]
+
+    runner.random_seed = 42
+    seeds = runner._get_attribute_seeds()
+    assert seeds == runner._get_attribute_seeds()
+    assert len(set(seeds)) == len(runner.attributes)
+    # nearby random seeds should not share any of the attributes' random streams
+    runner.random_seed = 43
+    assert set(seeds).isdisjoint(runner._get_attribute_seeds())
+
+
 def test_enrichment_runner_calculate_enrichment_serial():
     runner, truth = _test_enrichment_runner_calculate_enrichment_get_constants()
     assert truth == runner._calculate_enrichment_serial()
 
 
+def test_enrichment_runner_calculate_enrichment_serial_parallel_same_random_seed():
+    runner = EnrichmentRunner.__new__(EnrichmentRunner)
+    runner.attributes = ['attribute1', 'attribute2', 'attribute4']
+    runner.pvalue_kwargs = {}
+    runner.random_seed = 42
+
+    def enrichment_func(attr):
+        return [attr, np.random.random()]
+
+    runner.enrichment_func = enrichment_func
+    assert runner._calculate_enrichment_serial() == runner._calculate_enrichment_parallel()
+
+
 def test_enrichment_runner_correct_multiple_comparisons():
     runner = EnrichmentRunner.__new__(EnrichmentRunner)
 
@@ -794,6 +926,7 @@ def test_noncategorical_enrichment_runner_sign_test_enrichment(monkeypatch, attr
 
     monkeypatch.setattr(enrichment_runner, 'sign_test', validate_params)
     runner = NonCategoricalEnrichmentRunner.__new__(NonCategoricalEnrichmentRunner)
+    runner.gene_list = None
     runner.annotation_df = df
     runner.gene_set = gene_set
 
@@ -822,6 +955,7 @@ def test_noncategorical_enrichment_runner_one_sample_t_test_enrichment(monkeypat
 
     monkeypatch.setattr(enrichment_runner, 'ttest_1samp', validate_params)
     runner = NonCategoricalEnrichmentRunner.__new__(NonCategoricalEnrichmentRunner)
+    runner.gene_list = None
     runner.annotation_df = df
     runner.gene_set = gene_set
 
@@ -869,6 +1003,7 @@ def test_noncategorical_enrichment_runner_plot_results(monkeypatch):
 @pytest.mark.parametrize('n_bins', [2, 8])
 def test_noncategorical_enrichment_runner_enrichment_histogram(plot_style, plot_log_scale, parametric_test, n_bins):
     runner = NonCategoricalEnrichmentRunner.__new__(NonCategoricalEnrichmentRunner)
+    runner.gene_list = None
     runner.plot_style = plot_style
     runner.plot_log_scale = plot_log_scale
     runner.parametric_test = parametric_test
@@ -987,6 +1122,7 @@ def test_go_enrichment_runner_fetch_annotations(monkeypatch):
     monkeypatch.setattr(GOEnrichmentRunner, '_get_query_key', lambda self: 'the_query_key')
     monkeypatch.setattr(GOEnrichmentRunner, '_generate_annotation_df', lambda self: 'goa_df')
     runner = GOEnrichmentRunner.__new__(GOEnrichmentRunner)
+    runner.gene_id_type = 'auto'
     runner.fetch_annotations()
     assert runner.annotation_df == 'goa_df'
     assert runner.GOA_DF_QUERIES['the_query_key'] == 'goa_df'
@@ -997,6 +1133,25 @@ def test_go_enrichment_runner_fetch_annotations(monkeypatch):
     assert runner.GOA_DF_QUERIES['the_query_key'] == 'another_goa_df'
 
 
+def test_go_enrichment_runner_fetch_annotations_disk_cache(monkeypatch, tmp_path):
+    monkeypatch.setattr(io, 'get_todays_cache_dir', lambda: tmp_path)
+    monkeypatch.setattr(GOEnrichmentRunner, 'GOA_DF_QUERIES', {})
+    monkeypatch.setattr(GOEnrichmentRunner, '_get_query_key', lambda self: ('the_query_key', self.gene_id_type))
+    monkeypatch.setattr(GOEnrichmentRunner, '_generate_annotation_df', lambda self: pd.DataFrame({'GO:1': [True]}))
+    runner = GOEnrichmentRunner.__new__(GOEnrichmentRunner)
+    runner.gene_id_type = 'UniProtKB'
+    runner.fetch_annotations()
+    assert len(list(tmp_path.iterdir())) == 1
+
+    def generate_annotation_df(self):
+        raise AssertionError('annotations should be loaded from the cache')
+
+    monkeypatch.setattr(GOEnrichmentRunner, '_generate_annotation_df', generate_annotation_df)
+    monkeypatch.setattr(GOEnrichmentRunner, 'GOA_DF_QUERIES', {})
+    runner.fetch_annotations()
+    assert runner.annotation_df.equals(pd.DataFrame({'GO:1': [True]}))
+
+
 def test_go_enrichment_runner_get_annotation_iterator(monkeypatch):
     def alt_init(self, taxon_id, aspects, evidence_types, excluded_evidence_types, databases, excluded_databases,
                  qualifiers, excluded_qualifiers):
@@ -1646,6 +1801,7 @@ def test_go_enrichment_runner_hypergeometric_enrichment(monkeypatch, params, go_
 
     monkeypatch.setattr(GOEnrichmentRunner, '_calc_hypergeometric_pval', alt_calc_pval)
     runner = GOEnrichmentRunner.__new__(GOEnrichmentRunner)
+    runner.gene_list = None
     runner.annotation_df = pd.read_csv('tests/test_files/attr_ref_table_for_tests.csv', index_col=0).apply(np.ceil)
     runner.gene_set = {'WBGene00000019', 'WBGene00000041', 'WBGene00000106', 'WBGene00001133', 'WBGene00003915',
                        'WBGene00268195'}
@@ -1671,6 +1827,7 @@ def test_go_enrichment_runner_fisher_enrichment(monkeypatch, params, go_id, trut
 
     monkeypatch.setattr(GOEnrichmentRunner, '_calc_fisher_pval', alt_calc_pval)
     runner = GOEnrichmentRunner.__new__(GOEnrichmentRunner)
+    runner.gene_list = None
     runner.annotation_df = pd.read_csv('tests/test_files/attr_ref_table_for_tests.csv', index_col=0).apply(np.ceil)
     runner.gene_set = {'WBGene00000019', 'WBGene00000041', 'WBGene00000106', 'WBGene00001133', 'WBGene00003915',
                        'WBGene00268195'}
@@ -1690,6 +1847,7 @@ def test_go_enrichment_runner_fisher_enrichment(monkeypatch, params, go_id, trut
                           ('attribute4', (38, 6, 1, 2), 2)])
 def test_go_enrichment_runner_get_hypergeometric_parameters(monkeypatch, go_id, results, mod_df_ind):
     runner = GOEnrichmentRunner.__new__(GOEnrichmentRunner)
+    runner.gene_list = None
     annotation_df = pd.read_csv('tests/test_files/attr_ref_table_for_tests.csv', index_col=0)
     runner.mod_annotation_dfs = [None, None, None]
     runner.mod_annotation_dfs[mod_df_ind] = annotation_df
@@ -1795,6 +1953,7 @@ def test_kegg_enrichment_runner_fetch_annotations(monkeypatch):
     monkeypatch.setattr(KEGGEnrichmentRunner, '_get_query_key', lambda self: 'the_query_key')
     monkeypatch.setattr(KEGGEnrichmentRunner, '_generate_annotation_df', lambda self: ('kegg_df', 'pathway_names'))
     runner = KEGGEnrichmentRunner.__new__(KEGGEnrichmentRunner)
+    runner.gene_id_type = 'auto'
     runner.fetch_annotations()
     assert runner.annotation_df == 'kegg_df'
     assert runner.KEGG_DF_QUERIES['the_query_key'] == ('kegg_df', 'pathway_names')
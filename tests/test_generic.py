@@ -115,3 +115,28 @@ def test_get_signature(func, obj, truth):
         assert param.name == key
         assert param.annotation == val['annotation']
         assert param.default == val['default']
+
+
+def test_get_signature_bound_method_cached():
+    first_obj = TestObj()
+    signature = get_method_signature('fourth_test_func', first_obj)
+    assert get_method_signature('fourth_test_func', TestObj()) is signature
+    assert get_method_signature(first_obj.fourth_test_func) is signature
+    assert 'self' not in signature
+
+
+@pytest.mark.parametrize('colors,truth', [([(1, 0, 0)], (1, 0, 0)),
+                                          ([(1, 0, 0), (0, 0.5, 0)], (0.7, 0.35, 0)),
+                                          ([(1, 0, 0), (0, 0.5, 0), (0.2, 0.2, 1)], (0.48, 0.28, 0.4)),
+                                          ([(1, 1, 1), (1, 1, 1)], (1, 1, 1))])
+def test_mix_colors(colors, truth):
+    assert np.allclose(mix_colors(*colors), truth)
+
+
+def test_mix_colors_by_membership():
+    colors = [(1, 0, 0), (0, 0.5, 0), (0.2, 0.2, 1)]
+    membership = [(0, 0, 1), (1, 1, 0), (1, 0, 1), (1, 1, 1)]
+    res = mix_colors_by_membership(membership, colors)
+    assert res.shape == (len(membership), 3)
+    for row, color in zip(membership, res):
+        assert np.allclose(color, mix_colors(*[colors[i] for i, is_present in enumerate(row) if is_present]))
@@ -610,6 +610,16 @@ def test_EnrichmentWindow_is_categorical(qtbot, enrichment_window, button_name,
     assert enrichment_window.is_categorical() == truth
 
 
+def test_EnrichmentWindow_update_uis_same_analysis(qtbot, enrichment_window):
+    enrichment_window.widgets['dataset_radiobox'].radio_buttons['Gene Ontology (GO)'].click()
+    param_widgets = enrichment_window.parameter_widgets.copy()
+    enrichment_window.widgets['dataset_radiobox'].radio_buttons['Gene Ontology (GO)'].click()
+    assert enrichment_window.parameter_widgets == param_widgets
+
+    enrichment_window.widgets['dataset_radiobox'].radio_buttons['Categorical attributes'].click()
+    assert enrichment_window.parameter_widgets.keys() != param_widgets.keys()
+
+
 @pytest.mark.parametrize('en_set,bg_set,en_set_truth,bg_set_truth,', [
     ('first tab', 'second tab', 'first tab', 'second tab'),
     ('third tab', 'first tab', 'third tab', 'first tab'),
@@ -1092,6 +1102,18 @@ def test_SetOperationWindow_apply_set_op_majority_vote(qtbot, set_op_window, thr
     assert blocker.args[0] == truth
 
 
+@pytest.mark.parametrize('func_name,kwargs,truth', [
+    ('union', {}, {'a', 'b', 'c', 'd', 'e'}),
+    ('intersection', {'inplace': False}, {'b'}),
+    ('difference', {'inplace': False}, {'a'}),
+    ('majority_vote_intersection', {'majority_threshold': 0.6}, {'b', 'c', 'd'})
+])
+def test_SetOperationWindow_apply_set_op_to_set(func_name, kwargs, truth):
+    other_filter = filtering.Filter.from_dataframe(pd.DataFrame(index=['b', 'd', 'e']), 'other')
+    res = SetOperationWindow._apply_set_op_to_set({'a', 'b', 'c'}, func_name, [{'b', 'c', 'd'}, other_filter], kwargs)
+    assert res == truth
+
+
 def test_SetVisualizationWindow_init(qtbot, set_vis_window):
     _ = set_vis_window
 
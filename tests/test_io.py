@@ -61,6 +61,20 @@ def test_load_csv_drop_columns():
         load_csv('tests/test_files/counted.csv', 0, drop_columns=['cond1', 'cond6'])
 
 
+def test_load_reference_table(tmp_path):
+    pth = tmp_path / 'ref_table.csv'
+    pd.DataFrame({'gene': ['gene1', 'gene2'], 'biotype': ['protein_coding', 'pseudogene']}).to_csv(pth, index=False)
+    loaded = load_reference_table(pth)
+    assert loaded.equals(load_csv(pth))
+    # modifying the returned table should not affect later loads
+    loaded.set_index('gene', inplace=True)
+    assert load_reference_table(pth).equals(load_csv(pth))
+
+    pd.DataFrame({'gene': ['gene3'], 'biotype': ['lincRNA']}).to_csv(pth, index=False)
+    os.utime(pth, ns=(pth.stat().st_atime_ns, pth.stat().st_mtime_ns + 10 ** 9))
+    assert load_reference_table(pth).equals(load_csv(pth))
+
+
 def test_save_csv():
     try:
         df = pd.read_csv('tests/test_files/enrichment_hypergeometric_res.csv', index_col=0)
@@ -534,6 +548,22 @@ def test_cache_file():
         remove_cached_test_file(cached_filename)
 
 
+def test_cache_object():
+    cached_filename = 'test.pkl'
+    remove_cached_test_file(cached_filename)
+
+    cache_content_truth = (pd.DataFrame({'a': [1, 2], 'b': [True, False]}), {'path1': 'name1'})
+    assert load_cached_object(cached_filename) is None
+
+    cache_object(cache_content_truth, cached_filename)
+    try:
+        df, names = load_cached_object(cached_filename)
+        assert df.equals(cache_content_truth[0])
+        assert names == cache_content_truth[1]
+    finally:
+        remove_cached_test_file(cached_filename)
+
+
 @pytest.mark.parametrize("gene_set,expected_split", [
     ({1, 2, 3}, ['1', '2', '3']),
     ({'geneA', 'geneB', 'geneC', 'geneD'}, ["geneA", "geneB", "geneC", "geneD"])
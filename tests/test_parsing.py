@@ -182,6 +182,32 @@ def test_generate_upset_series():
     assert srs.sort_index().equals(srs_truth.sort_index())
 
 
+@pytest.mark.parametrize('sets,expected', [
+    ([{'1', '2', '3', '4'}, {'2', '3', '4', '5', '6'}], [0, 1, 2, 3]),
+    ([{'1', '2', '3', '6'}, {'2', '3', '4', '5', '6'}, {'1', '5', '6'}], [0, 0, 1, 2, 0, 1, 1, 1]),
+    ([set(), {'1'}], [0, 0, 1, 0])])
+def test_count_set_memberships(sets, expected):
+    assert list(count_set_memberships(sets)) == expected
+
+
+@pytest.mark.parametrize('sets,truth', [
+    ([{'1', '2', '3', '4'}, {'2', '3', '4', '5', '6'}], (1, 2, 3)),
+    ([{'1', '2', '3', '6'}, {'2', '3', '4', '5', '6'}, {'1', '5', '6'}], (0, 1, 2, 0, 1, 1, 1)),
+    ([set(), {'1'}, {'1', '2'}], (0, 0, 0, 1, 0, 1, 0))])
+def test_venn_region_sizes(sets, truth):
+    assert venn_region_sizes(sets) == truth
+
+
+@pytest.mark.parametrize('n_sets,sort_by_size,truth', [
+    (1, True, ((1,),)),
+    (2, False, ((0, 1), (1, 0), (1, 1))),
+    (2, True, ((1, 0), (0, 1), (1, 1))),
+    (3, False, ((0, 0, 1), (0, 1, 0), (0, 1, 1), (1, 0, 0), (1, 0, 1), (1, 1, 0), (1, 1, 1))),
+    (3, True, ((1, 0, 0), (0, 1, 0), (0, 0, 1), (1, 1, 0), (1, 0, 1), (0, 1, 1), (1, 1, 1)))])
+def test_generate_patch_ids(n_sets, sort_by_size, truth):
+    assert generate_patch_ids(n_sets, sort_by_size) == truth
+
+
 @pytest.mark.parametrize('version,expected', [('3.0.0', [3, 0, 0]), ('0.1.3', [0, 1, 3]), ('2.0.5', [2, 0, 5])])
 def test_parse_version(version, expected):
     assert parse_version(version) == expected